@@ -5,43 +5,94 @@ Provides common functionality and interface for all specialized agents.
 """
 
 from abc import ABC, abstractmethod
-from typing import Dict, Optional, Any
+from typing import AsyncIterator, Dict, Iterator, Optional, Any
 import time
 
+from backend.services.llm_service import call_with_system
+
 
 class BaseAgent(ABC):
     """Abstract base class for all agents in the system."""
 
-    def __init__(self, llm_provider: str = "openai", api_key: Optional[str] = None, catalog: Optional[Any] = None):
+    def __init__(self, llm_provider: str = "openai", api_key: Optional[str] = None, catalog: Optional[Any] = None,
+                 request_timeout: Optional[float] = None):
         """Initialize base agent.
 
         Args:
             llm_provider: LLM provider to use (e.g., 'openai')
             api_key: API key for the LLM provider
             catalog: Optional catalog instance for semantic search
+            request_timeout: Per-request LLM timeout in seconds (provider default if None)
         """
         from backend.services.llm_service import LLMService
 
         self.llm_provider = llm_provider
         self.api_key = api_key
-        self.llm = LLMService.get_provider(llm_provider, api_key)
+        options = {"request_timeout": request_timeout} if request_timeout is not None else {}
+        self.llm = LLMService.get_provider(llm_provider, api_key, **options)
         self.catalog = catalog
         self.context = {}
         self.state = {}
 
-    def generate_response(self, prompt: str, max_tokens: int = 200) -> str:
+    def generate_response(self, prompt: str, max_tokens: int = 200, system: Optional[str] = None) -> str:
         """Generate response using the configured LLM.
 
         Args:
             prompt: The prompt to send to the LLM
             max_tokens: Maximum tokens in the response
+            system: Optional system instructions, sent ahead of the prompt
+
+        Returns:
+            Generated response text
+        """
+        if self.llm is None:
+            raise RuntimeError(f"LLM provider '{self.llm_provider}' failed to initialize")
+        return call_with_system(self.llm.generate, prompt, max_tokens, system)
+
+    async def agenerate_response(self, prompt: str, max_tokens: int = 200, system: Optional[str] = None) -> str:
+        """Generate response using the configured LLM without blocking the event loop.
+
+        Args:
+            prompt: The prompt to send to the LLM
+            max_tokens: Maximum tokens in the response
+            system: Optional system instructions, sent ahead of the prompt
 
         Returns:
             Generated response text
         """
         if self.llm is None:
             raise RuntimeError(f"LLM provider '{self.llm_provider}' failed to initialize")
-        return self.llm.generate(prompt, max_tokens=max_tokens)
+        return await call_with_system(self.llm.agenerate, prompt, max_tokens, system)
+
+    def stream_response(self, prompt: str, max_tokens: int = 200, system: Optional[str] = None) -> Iterator[str]:
+        """Stream a response from the configured LLM chunk by chunk.
+
+        Args:
+            prompt: The prompt to send to the LLM
+            max_tokens: Maximum tokens in the response
+            system: Optional system instructions, sent ahead of the prompt
+
+        Returns:
+            Iterator over pieces of the generated text
+        """
+        if self.llm is None:
+            raise RuntimeError(f"LLM provider '{self.llm_provider}' failed to initialize")
+        return call_with_system(self.llm.stream, prompt, max_tokens, system)
+
+    def astream_response(self, prompt: str, max_tokens: int = 200, system: Optional[str] = None) -> AsyncIterator[str]:
+        """Async-stream a response from the configured LLM chunk by chunk.
+
+        Args:
+            prompt: The prompt to send to the LLM
+            max_tokens: Maximum tokens in the response
+            system: Optional system instructions, sent ahead of the prompt
+
+        Returns:
+            Async iterator over pieces of the generated text
+        """
+        if self.llm is None:
+            raise RuntimeError(f"LLM provider '{self.llm_provider}' failed to initialize")
+        return call_with_system(self.llm.astream, prompt, max_tokens, system)
 
     def build_prompt(self, **kwargs) -> str:
         """Build a prompt for the LLM. To be implemented by subclasses.
@@ -63,9 +114,9 @@ class BaseAgent(ABC):
     def measure_time(func):
         """Decorator to measure execution time."""
         def wrapper(*args, **kwargs):
-            start = time.time()
+            start = time.perf_counter()
             result = func(*args, **kwargs)
-            elapsed = time.time() - start
+            elapsed = time.perf_counter() - start
             if isinstance(result, dict):
                 result['latency'] = elapsed
             return result
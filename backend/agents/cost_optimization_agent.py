@@ -47,7 +47,7 @@ class CostOptimizationAgent(BaseAgent):
         Returns:
             Dict with analysis and cost saving recommendations
         """
-        start_time = time.time()
+        start_time = time.perf_counter()
 
         # Create initial analysis prompt
         prompt = self._build_analysis_prompt(selected_item, request)
@@ -69,7 +69,7 @@ class CostOptimizationAgent(BaseAgent):
                     "timestamp": time.time()
                 }
             ],
-            "latency": time.time() - start_time
+            "latency": time.perf_counter() - start_time
         }
 
         self.conversation_history.append(("agent", analysis))
@@ -88,7 +88,7 @@ class CostOptimizationAgent(BaseAgent):
         Returns:
             Agent response with updated conversation
         """
-        start_time = time.time()
+        start_time = time.perf_counter()
 
         # Build context from conversation
         context = self._build_chat_context(conversation)
@@ -130,7 +130,7 @@ Rules:
             "role": "agent",
             "message": response,
             "timestamp": time.time(),
-            "latency": time.time() - start_time
+            "latency": time.perf_counter() - start_time
         }
 
         return result
@@ -4,24 +4,95 @@ Negotiation Agent - LLM-powered vendor negotiation agent.
 Simulates vendor responses and negotiates terms with the buyer using semantic awareness.
 """
 
-import json
+import asyncio
+import random
+import re
 import time
-from typing import List, Dict, Optional, Any
+from collections import deque
+from datetime import datetime, timedelta
+from typing import AsyncIterator, Iterator, List, Dict, Optional, Any, Tuple
+from functools import lru_cache
 from backend.agents.base_agent import BaseAgent
+from backend.services.response_cache import SemanticResponseCache
+
+try:
+    import tiktoken
+except ImportError:
+    tiktoken = None
+
+
+# Patterns used to pull negotiated terms out of vendor replies
+# (e.g. "$5000 per unit", "$4,800/unit", "14 days delivery", "10-day")
+_RE_PRICE = re.compile(r'\$(\d+(?:,?\d{3})*(?:\.\d+)?)\s*(?:per unit|/unit)?', re.IGNORECASE)
+_RE_LEAD_TIME = re.compile(r'(\d+)\s*(?:day|days)?\s*(?:delivery|lead time)?', re.IGNORECASE)
+
+# Conversation message roles
+ROLE_VENDOR = "vendor"
+ROLE_BUYER = "buyer"
+
+# Buyer replies to the order confirmation prompt (substring match on the lowered message)
+_CONFIRM_KEYWORDS = ('yes', 'confirm', 'accept', 'proceed', 'go ahead', 'submit')
+_REJECT_KEYWORDS = ('no', 'cancel', 'wait', 'hold', 'reconsider', "don't")
+
+# Token budget for the conversation history included in the vendor prompt
+_CONTEXT_TOKEN_BUDGET = 1024
+
+# Starts the order summary footer appended to every vendor reply (see _build_confirmation_request)
+_CONFIRMATION_SEPARATOR = "\n---\n"
+
+# Vendor role and negotiation rules, identical for every session. Sent first as the
+# system message so all negotiations share one cacheable prompt prefix.
+SYSTEM_PROMPT = """You are a sales representative negotiating a component order with a buyer.
+
+Your negotiation goals:
+1. Protect pricing for small orders
+2. Offer meaningful discounts only for volume commitments (50+ units)
+3. Be flexible on delivery timelines but charge for expedited shipping
+4. Maintain professional but firm tone
+5. Remember all previous offers made in this conversation
+
+Respond as the vendor to the buyer's latest message. Be dynamic and natural. Consider the buyer's request carefully:
+- If asking about price, reference specific quantities and offer tiered discounts
+- If asking about delivery, discuss timelines and potential expediting fees
+- If negotiating on previous offers, acknowledge their position but stay firm on your business model
+- Keep response to 2-3 sentences, direct and professional"""
+
+
+@lru_cache(maxsize=1)
+def _get_encoding():
+    """Load the tokenizer once (None if tiktoken or its encoding files are unavailable)."""
+    if tiktoken is None:
+        return None
+    try:
+        return tiktoken.get_encoding("cl100k_base")
+    except Exception:
+        return None
+
+
+def _count_tokens(text: str) -> int:
+    """Count tokens in text, estimating ~4 characters per token without tiktoken."""
+    encoding = _get_encoding()
+    if encoding is None:
+        return len(text) // 4 + 1
+    return len(encoding.encode(text))
 
 
 class NegotiationAgent(BaseAgent):
     """LLM-powered agent representing vendor in negotiations with semantic awareness."""
 
-    def __init__(self, llm_provider: str = "openai", api_key: str = None, catalog: Optional[Any] = None):
+    def __init__(self, llm_provider: str = "openai", api_key: str = None, catalog: Optional[Any] = None,
+                 response_cache: Optional[SemanticResponseCache] = None, request_timeout: Optional[float] = None):
         """Initialize the negotiation agent as a vendor.
 
         Args:
             llm_provider: LLM provider to use
             api_key: API key for LLM provider
             catalog: Catalog instance for finding competitive alternatives
+            response_cache: Optional semantic cache shared across sessions for buyer turns
+            request_timeout: Per-request LLM timeout in seconds before retrying (provider default if None)
         """
-        super().__init__(llm_provider, api_key, catalog)
+        super().__init__(llm_provider, api_key, catalog, request_timeout=request_timeout)
+        self.response_cache = response_cache
         self.selected_item = None
         self.negotiation_state = {
             "discount_offered": 0,
@@ -33,6 +104,19 @@ class NegotiationAgent(BaseAgent):
             "final_lead_time": None,
             "quantity": None
         }
+        # (line, token count) for the recent conversation window, extended in place each turn,
+        # plus a one-line summary of the messages evicted from the front of the window
+        self._context_lines = deque()
+        self._context_tokens = 0
+        self._context_dropped = 0
+        self._context_quotes = deque(maxlen=3)
+        self._context_summary = ""
+        self._context_cache_len = 0
+        self._context_cache_tail = None
+        # Order summary text and static order fields, built once per selected item
+        self._confirmation_str = None
+        self._order_details = None
+        self._system_prompt = None
 
     def process(self, selected_item: Dict, request: Dict) -> Dict:
         """Main processing method for starting negotiation.
@@ -57,143 +141,355 @@ class NegotiationAgent(BaseAgent):
         Returns:
             Dict with vendor's opening position
         """
-        self.selected_item = selected_item
-        start_time = time.time()
+        self._select_item(selected_item)
+        start_ns = time.monotonic_ns()
 
         prompt = self._build_opening_prompt(selected_item, request)
         vendor_opening = self.generate_response(prompt, max_tokens=200)
 
-        result = {
+        return self._opening_result(selected_item, vendor_opening, start_ns)
+
+    async def astart_negotiation(self, selected_item: Dict, request: Dict) -> Dict:
+        """Async variant of start_negotiation that awaits the LLM instead of blocking.
+
+        Args:
+            selected_item: The selected component from procurement
+            request: Original procurement request
+
+        Returns:
+            Dict with vendor's opening position
+        """
+        self._select_item(selected_item)
+        start_ns = time.monotonic_ns()
+
+        prompt = self._build_opening_prompt(selected_item, request)
+        vendor_opening = await self.agenerate_response(prompt, max_tokens=200)
+
+        return self._opening_result(selected_item, vendor_opening, start_ns)
+
+    def respond_to_offer(self, user_message: str, conversation: List[Dict], request: Dict = None) -> Dict:
+        """
+        Vendor responds to buyer's negotiation message using LLM.
+
+        Args:
+            user_message: Buyer's proposal or question
+            conversation: Current negotiation history
+            request: Original procurement request (for context)
+
+        Returns:
+            Vendor's response with order confirmation workflow
+        """
+        start_ns = time.monotonic_ns()
+
+        # If the buyer is answering the confirmation prompt, no LLM call is needed
+        reply = self._handle_confirmation_reply(user_message, start_ns)
+        if reply is not None:
+            return reply
+
+        prompt = self._prepare_response_prompt(user_message, conversation, request)
+
+        # Generate response using LLM (near-duplicate buyer questions for this item, at the same
+        # negotiated terms, may hit the cache)
+        if self.response_cache is not None:
+            response = self.response_cache.get_or_generate(
+                self._response_cache_namespace(),
+                user_message,
+                lambda: self.generate_response(prompt, max_tokens=200, system=self._system_prompt)
+            )
+        else:
+            response = self.generate_response(prompt, max_tokens=200, system=self._system_prompt)
+
+        return self._finalize_response(response, start_ns)
+
+    async def arespond_to_offer(self, user_message: str, conversation: List[Dict], request: Dict = None) -> Dict:
+        """Async variant of respond_to_offer that awaits the LLM instead of blocking.
+
+        Args:
+            user_message: Buyer's proposal or question
+            conversation: Current negotiation history
+            request: Original procurement request (for context)
+
+        Returns:
+            Vendor's response with order confirmation workflow
+        """
+        start_ns = time.monotonic_ns()
+
+        reply = self._handle_confirmation_reply(user_message, start_ns)
+        if reply is not None:
+            return reply
+
+        prompt = self._prepare_response_prompt(user_message, conversation, request)
+
+        if self.response_cache is not None:
+            # Cache lookups embed the message over the network, so run them off the event loop
+            # (SemanticResponseCache is lock-guarded, so concurrent sessions can share it)
+            response = await asyncio.to_thread(
+                self.response_cache.get_or_generate,
+                self._response_cache_namespace(),
+                user_message,
+                lambda: self.generate_response(prompt, max_tokens=200, system=self._system_prompt)
+            )
+        else:
+            response = await self.agenerate_response(prompt, max_tokens=200, system=self._system_prompt)
+
+        return self._finalize_response(response, start_ns)
+
+    @staticmethod
+    async def arespond_to_offers_batch(turns: List[Tuple["NegotiationAgent", str, List[Dict]]],
+                                       request: Dict = None, concurrency_limit: int = 8) -> List[Dict]:
+        """Respond to buyer turns in several negotiation sessions concurrently.
+
+        Each turn runs arespond_to_offer on its own agent, with at most concurrency_limit
+        LLM calls in flight. An agent holds the state of one session, so each agent should
+        appear in at most one turn. A turn that fails does not affect the others: its
+        exception is returned in its place instead of being raised.
+
+        Args:
+            turns: (agent, user_message, conversation) for each session
+            request: Original procurement request (for context)
+            concurrency_limit: Maximum turns awaiting the LLM at once
+
+        Returns:
+            Vendor responses (or the exception a turn raised), in the same order as turns
+        """
+        semaphore = asyncio.Semaphore(concurrency_limit)
+
+        async def respond(agent: "NegotiationAgent", user_message: str, conversation: List[Dict]) -> Dict:
+            async with semaphore:
+                return await agent.arespond_to_offer(user_message, conversation, request=request)
+
+        return list(await asyncio.gather(*(respond(*turn) for turn in turns), return_exceptions=True))
+
+    @staticmethod
+    def respond_to_offers_batch(turns: List[Tuple["NegotiationAgent", str, List[Dict]]],
+                                request: Dict = None, concurrency_limit: int = 8) -> List[Dict]:
+        """Synchronous wrapper around arespond_to_offers_batch (not for use inside an event loop)."""
+        return asyncio.run(NegotiationAgent.arespond_to_offers_batch(turns, request, concurrency_limit))
+
+    def stream_response_to_offer(self, user_message: str, conversation: List[Dict],
+                                 request: Dict = None) -> Iterator[Dict]:
+        """Streaming variant of respond_to_offer.
+
+        Yields {"type": "token", "content": ...} events as the vendor reply is generated,
+        then a single {"type": "final", ...} event carrying the same fields respond_to_offer
+        returns (the full message with the confirmation footer, order details, latency).
+
+        Args:
+            user_message: Buyer's proposal or question
+            conversation: Current negotiation history
+            request: Original procurement request (for context)
+
+        Yields:
+            Token events followed by the final response event
+        """
+        start_ns = time.monotonic_ns()
+
+        reply = self._handle_confirmation_reply(user_message, start_ns)
+        if reply is not None:
+            yield {"type": "final", **reply}
+            return
+
+        prompt = self._prepare_response_prompt(user_message, conversation, request)
+
+        if self.response_cache is not None:
+            # The cache stores whole responses, so a cached turn arrives as one chunk
+            chunks = [self.response_cache.get_or_generate(
+                self._response_cache_namespace(),
+                user_message,
+                lambda: self.generate_response(prompt, max_tokens=200, system=self._system_prompt)
+            )]
+            yield {"type": "token", "content": chunks[0]}
+        else:
+            chunks = []
+            for chunk in self.stream_response(prompt, max_tokens=200, system=self._system_prompt):
+                chunks.append(chunk)
+                yield {"type": "token", "content": chunk}
+
+        yield {"type": "final", **self._finalize_response("".join(chunks), start_ns)}
+
+    async def astream_response_to_offer(self, user_message: str, conversation: List[Dict],
+                                        request: Dict = None) -> AsyncIterator[Dict]:
+        """Async variant of stream_response_to_offer; yields the same events.
+
+        Args:
+            user_message: Buyer's proposal or question
+            conversation: Current negotiation history
+            request: Original procurement request (for context)
+
+        Yields:
+            Token events followed by the final response event
+        """
+        start_ns = time.monotonic_ns()
+
+        reply = self._handle_confirmation_reply(user_message, start_ns)
+        if reply is not None:
+            yield {"type": "final", **reply}
+            return
+
+        prompt = self._prepare_response_prompt(user_message, conversation, request)
+
+        if self.response_cache is not None:
+            chunks = [await asyncio.to_thread(
+                self.response_cache.get_or_generate,
+                self._response_cache_namespace(),
+                user_message,
+                lambda: self.generate_response(prompt, max_tokens=200, system=self._system_prompt)
+            )]
+            yield {"type": "token", "content": chunks[0]}
+        else:
+            chunks = []
+            async for chunk in self.astream_response(prompt, max_tokens=200, system=self._system_prompt):
+                chunks.append(chunk)
+                yield {"type": "token", "content": chunk}
+
+        yield {"type": "final", **self._finalize_response("".join(chunks), start_ns)}
+
+    def _response_cache_namespace(self) -> tuple:
+        """Response cache namespace: the item plus the terms negotiated so far.
+
+        Replies are only shared between sessions at the same point in the negotiation, so a
+        cached reply cannot contradict an offer this session has already received.
+        """
+        return (self.selected_item.get("id"), *sorted(self.negotiation_state.items()))
+
+    def _select_item(self, selected_item: Dict) -> None:
+        """Set the item under negotiation and pre-build the text derived from it."""
+        self.selected_item = selected_item
+        self._confirmation_str = self._build_confirmation_request()
+        self._order_details = self._build_order_details()
+        self._system_prompt = self._build_vendor_instructions(selected_item)
+
+    def _opening_result(self, selected_item: Dict, vendor_opening: str, start_ns: int) -> Dict:
+        """Package the vendor's opening message as the start_negotiation result."""
+        return {
             "selected_item": selected_item,
             "vendor_opening": vendor_opening,
             "conversation": [
                 {
-                    "role": "vendor",
+                    "role": ROLE_VENDOR,
                     "message": vendor_opening,
                     "timestamp": time.time()
                 }
             ],
-            "latency": time.time() - start_time
+            "latency": self._elapsed_since(start_ns)
         }
 
-        return result
-
-    def respond_to_offer(self, user_message: str, conversation: List[Dict], request: Dict = None) -> Dict:
-        """
-        Vendor responds to buyer's negotiation message using LLM.
+    def _handle_confirmation_reply(self, user_message: str, start_ns: int) -> Optional[Dict]:
+        """Handle a buyer reply to the order confirmation prompt.
 
         Args:
-            user_message: Buyer's proposal or question
-            conversation: Current negotiation history
-            request: Original procurement request (for context)
+            user_message: Buyer's message
+            start_ns: time.monotonic_ns() reading taken when the turn started
 
         Returns:
-            Vendor's response with order confirmation workflow
+            The vendor response if the message confirms or rejects the order, else None
         """
-        start_time = time.time()
-        import re
+        if not self.negotiation_state.get("confirmation_asked"):
+            return None
 
-        # Check if user is confirming or rejecting order
         msg_lower = user_message.lower()
 
         # If order was confirmed, submit it
-        if self.negotiation_state.get("confirmation_asked"):
-            if any(word in msg_lower for word in ['yes', 'confirm', 'accept', 'proceed', 'go ahead', 'submit']):
-                self.negotiation_state["order_confirmed"] = True
-                return {
-                    "role": "vendor",
-                    "message": f"Perfect! Order confirmed. Your order for {self.selected_item.get('id')} has been submitted. You will receive a confirmation email shortly.",
-                    "timestamp": time.time(),
-                    "latency": time.time() - start_time,
-                    "order_status": "confirmed",
-                    "order_details": self._get_order_details(),
-                    "receipt": self._generate_receipt()
-                }
-            elif any(word in msg_lower for word in ['no', 'cancel', 'wait', 'hold', 'reconsider', "don't"]):
-                # Reset confirmation state, wait for user input
-                self.negotiation_state["confirmation_asked"] = False
-                return {
-                    "role": "vendor",
-                    "message": "Understood. No problem - what would you like to adjust or discuss further?",
-                    "timestamp": time.time(),
-                    "latency": time.time() - start_time,
-                    "order_status": "waiting"
-                }
-
-        # Build context from conversation
+        if any(word in msg_lower for word in _CONFIRM_KEYWORDS):
+            self.negotiation_state["order_confirmed"] = True
+            return {
+                "role": ROLE_VENDOR,
+                "message": f"Perfect! Order confirmed. Your order for {self.selected_item.get('id')} has been submitted. You will receive a confirmation email shortly.",
+                "timestamp": time.time(),
+                "latency": self._elapsed_since(start_ns),
+                "order_status": "confirmed",
+                "order_details": self._get_order_details(),
+                "receipt": self._generate_receipt()
+            }
+        elif any(word in msg_lower for word in _REJECT_KEYWORDS):
+            # Reset confirmation state, wait for user input
+            self.negotiation_state["confirmation_asked"] = False
+            return {
+                "role": ROLE_VENDOR,
+                "message": "Understood. No problem - what would you like to adjust or discuss further?",
+                "timestamp": time.time(),
+                "latency": self._elapsed_since(start_ns),
+                "order_status": "waiting"
+            }
+        return None
+
+    def _prepare_response_prompt(self, user_message: str, conversation: List[Dict], request: Dict = None) -> str:
+        """Build the user prompt for a buyer turn from the conversation so far.
+
+        The vendor instructions are sent separately as the system prompt.
+        """
         context = self._build_negotiation_context(conversation)
-
-        # Build the negotiation prompt
-        prompt = self._build_negotiation_response_prompt(
+        return self._build_negotiation_response_prompt(
             user_message=user_message,
             context=context,
-            selected_item=self.selected_item,
             request=request
         )
 
-        # Generate response using LLM
-        response = self.generate_response(prompt, max_tokens=200)
+    def _finalize_response(self, response: str, start_ns: int) -> Dict:
+        """Record negotiated terms from a vendor reply and append the confirmation request.
+
+        Args:
+            response: Vendor reply generated by the LLM
+            start_ns: time.monotonic_ns() reading taken when the turn started
 
+        Returns:
+            Vendor response dict
+        """
         # Extract negotiated price from vendor response
         self._extract_negotiated_terms(response)
 
         # Add order confirmation request at the end of vendor response
-        confirmation_request = self._build_confirmation_request()
-        final_response = f"{response}\n\n{confirmation_request}"
+        if self._confirmation_str is None:
+            self._confirmation_str = self._build_confirmation_request()
+        final_response = f"{response}\n\n{self._confirmation_str}"
 
         # Mark confirmation as asked
         self.negotiation_state["confirmation_asked"] = True
 
-        result = {
-            "role": "vendor",
+        return {
+            "role": ROLE_VENDOR,
             "message": final_response,
             "timestamp": time.time(),
-            "latency": time.time() - start_time,
+            "latency": self._elapsed_since(start_ns),
             "order_status": "negotiating",
             "order_details": self._get_order_details()
         }
 
-        return result
+    @staticmethod
+    def _elapsed_since(start_ns: int) -> float:
+        """Seconds elapsed since a time.monotonic_ns() reading (immune to wall-clock jumps)."""
+        return (time.monotonic_ns() - start_ns) / 1e9
+
+    def _build_negotiation_response_prompt(self, user_message: str, context: str, request: Dict = None) -> str:
+        """Build prompt for vendor's response to buyer's message.
+
+        Only the growing history and the buyer's latest message go here; the static vendor
+        instructions are the system prompt, so consecutive turns share a byte-identical
+        prefix that provider-side prompt caching can reuse.
+        """
+        if not context:
+            return f"Buyer's Latest Message: {user_message}"
 
-    def _build_negotiation_response_prompt(self, user_message: str, context: str, selected_item: Dict, request: Dict = None) -> str:
-        """Build prompt for vendor's response to buyer's message."""
+        return f"""Negotiation History:
+{context}
+
+Buyer's Latest Message: {user_message}"""
+
+    def _build_vendor_instructions(self, selected_item: Dict) -> str:
+        """Build the system prompt: shared negotiation rules, then this item's facts."""
         vendor = selected_item.get("vendor", "Unknown")
         item_id = selected_item.get("id")
         price = selected_item.get("price")
         lead_time = selected_item.get("lead_time_days")
         reliability = selected_item.get("reliability", 0.975)
 
-        item_context = f"""
-You are a sales representative from {vendor}.
+        return f"""{SYSTEM_PROMPT}
+
+You represent {vendor}.
 Product: {item_id}
 Standard Price: ${price}/unit
 Lead Time: {lead_time} days
-Reliability: {reliability}
-
-Your negotiation goals:
-1. Protect pricing for small orders
-2. Offer meaningful discounts only for volume commitments (50+ units)
-3. Be flexible on delivery timelines but charge for expedited shipping
-4. Maintain professional but firm tone
-5. Remember all previous offers made in this conversation"""
-
-        if context:
-            item_context += f"""
-
-Negotiation History:
-{context}"""
-
-        prompt = f"""{item_context}
-
-Buyer's Latest Message: {user_message}
-
-Respond as the vendor. Be dynamic and natural. Consider the buyer's request carefully:
-- If asking about price, reference specific quantities and offer tiered discounts
-- If asking about delivery, discuss timelines and potential expediting fees
-- If negotiating on previous offers, acknowledge their position but stay firm on your business model
-- Keep response to 2-3 sentences, direct and professional"""
-
-        return prompt
+Reliability: {reliability}"""
 
     def _build_opening_prompt(self, selected_item: Dict, request: Dict) -> str:
         """Build the opening negotiation prompt."""
@@ -216,39 +512,110 @@ Simply state the price, what makes this a good product, and ONE condition for be
         Args:
             vendor_response: The vendor's response message
         """
-        import re
-
         # Extract price (e.g., "$5000 per unit", "$4800/unit", "price of $4900")
-        price_match = re.search(r'\$(\d+(?:,?\d{3})*(?:\.\d+)?)\s*(?:per unit|/unit)?', vendor_response, re.IGNORECASE)
+        price_match = _RE_PRICE.search(vendor_response)
         if price_match:
             price_str = price_match.group(1).replace(',', '')
             try:
                 price = float(price_str)
-                if price > 0 and price < 100000:  # Sanity check
+                if price > 0 and price < 100000 and price != self.negotiation_state["final_price"]:  # Sanity check
                     self.negotiation_state["final_price"] = price
+                    self._confirmation_str = None
             except (ValueError, IndexError):
                 pass
 
         # Extract lead time (e.g., "14 days", "10-day", "within 5 days")
-        lead_time_match = re.search(r'(\d+)\s*(?:day|days)?\s*(?:delivery|lead time)?', vendor_response, re.IGNORECASE)
+        lead_time_match = _RE_LEAD_TIME.search(vendor_response)
         if lead_time_match:
             try:
                 lead_time = int(lead_time_match.group(1))
-                if lead_time > 0 and lead_time < 365:  # Sanity check
+                if lead_time > 0 and lead_time < 365 and lead_time != self.negotiation_state["final_lead_time"]:  # Sanity check
                     self.negotiation_state["final_lead_time"] = lead_time
+                    self._confirmation_str = None
             except (ValueError, IndexError):
                 pass
 
-    def _build_negotiation_context(self, conversation: List[Dict]) -> str:
-        """Build context from negotiation history - include full conversation for consistency."""
-        context_lines = []
-        for msg in conversation:
-            role = "Buyer" if msg.get("role") == "buyer" else "Vendor"
-            message = msg.get('message', '')
-            # Extract just the discount/price info to keep it concise
-            context_lines.append(f"{role}: {message}")
-        # Include full conversation history to ensure consistency
-        return "\n".join(context_lines)
+    def _build_negotiation_context(self, conversation: List[Dict], max_tokens: int = _CONTEXT_TOKEN_BUDGET) -> str:
+        """Build context from the most recent negotiation messages that fit a token budget.
+
+        Messages are evicted oldest first once the window exceeds max_tokens (the newest
+        message is always kept), and the evicted ones are replaced by a one-line summary
+        noting how many were dropped and the last prices the vendor quoted in them. The
+        conversation only grows between turns, so the window is kept between calls and only
+        messages added since the previous call are counted. The window is rebuilt if the
+        conversation shrank or no longer ends the cached prefix with the same message.
+
+        Args:
+            conversation: Negotiation history
+            max_tokens: Token budget for the included messages
+
+        Returns:
+            Context string for the vendor prompt
+        """
+        cached_len = self._context_cache_len
+        if (cached_len and len(conversation) >= cached_len
+                and self._context_message_key(conversation[cached_len - 1]) == self._context_cache_tail):
+            new_messages = conversation[cached_len:]
+        else:
+            self._context_lines.clear()
+            self._context_tokens = 0
+            self._context_dropped = 0
+            self._context_quotes.clear()
+            self._context_summary = ""
+            new_messages = conversation
+
+        for msg in new_messages:
+            line = self._format_context_line(msg)
+            tokens = _count_tokens(line)
+            self._context_lines.append((line, tokens))
+            self._context_tokens += tokens
+
+        evicted = False
+        while self._context_tokens > max_tokens and len(self._context_lines) > 1:
+            line, tokens = self._context_lines.popleft()
+            self._context_tokens -= tokens
+            self._context_dropped += 1
+            if line.startswith("Vendor: "):
+                self._remember_quotes(line)
+            evicted = True
+        if evicted:
+            self._context_summary = self._summarize_evicted()
+
+        self._context_cache_len = len(conversation)
+        self._context_cache_tail = self._context_message_key(conversation[-1]) if conversation else None
+
+        recent = "\n".join(line for line, _ in self._context_lines)
+        return f"{self._context_summary}\n{recent}" if self._context_summary else recent
+
+    def _remember_quotes(self, line: str) -> None:
+        """Record the prices quoted in a vendor line's body, most recent last and without repeats.
+
+        The order summary footer is skipped: it restates the current unit price on every
+        vendor reply rather than quoting a new one.
+        """
+        body = line.split(_CONFIRMATION_SEPARATOR, 1)[0]
+        for quote in _RE_PRICE.findall(body):
+            if quote in self._context_quotes:
+                self._context_quotes.remove(quote)
+            self._context_quotes.append(quote)
+
+    def _summarize_evicted(self) -> str:
+        """Summarize the messages evicted from the context window in one line."""
+        summary = f"[{self._context_dropped} earlier messages omitted"
+        if self._context_quotes:
+            summary += "; vendor prices quoted in them: " + ", ".join(f"${quote}" for quote in self._context_quotes)
+        return summary + "]"
+
+    @staticmethod
+    def _format_context_line(msg: Dict) -> str:
+        """Format one conversation message as a context line."""
+        role = "Buyer" if msg.get("role") == ROLE_BUYER else "Vendor"
+        return f"{role}: {msg.get('message', '')}"
+
+    @staticmethod
+    def _context_message_key(msg: Dict) -> tuple:
+        """Identity of a message used to check the cached context prefix still applies."""
+        return (msg.get("role"), msg.get("message", ""))
 
     def _build_confirmation_request(self) -> str:
         """Build order confirmation request with pricing and delivery details."""
@@ -261,9 +628,7 @@ Simply state the price, what makes this a good product, and ONE condition for be
         lead_time = self.negotiation_state.get("final_lead_time") or item.get('lead_time_days', 'N/A')
         item_id = item.get('id', 'N/A')
 
-        confirmation_text = f"""
----
-Would you like to confirm your order?
+        confirmation_text = f"""{_CONFIRMATION_SEPARATOR}Would you like to confirm your order?
 
 📋 Order Summary:
 • Item: {item_id}
@@ -279,14 +644,19 @@ Please confirm (YES) or make adjustments (NO)"""
         if not self.selected_item:
             return {}
 
-        item = self.selected_item
+        if self._order_details is None:
+            self._order_details = self._build_order_details()
+        return {**self._order_details, "order_confirmed": self.negotiation_state.get("order_confirmed", False)}
+
+    def _build_order_details(self) -> Dict:
+        """Build the order fields that only depend on the selected item."""
+        item = self.selected_item or {}
         return {
             "item_id": item.get('id'),
             "vendor": item.get('vendor'),
             "unit_price": item.get('price'),
             "lead_time_days": item.get('lead_time_days'),
-            "reliability": item.get('reliability'),
-            "order_confirmed": self.negotiation_state.get("order_confirmed", False)
+            "reliability": item.get('reliability')
         }
 
     def _generate_receipt(self) -> Dict:
@@ -304,7 +674,6 @@ Please confirm (YES) or make adjustments (NO)"""
         final_lead_time = self.negotiation_state.get("final_lead_time") or item.get('lead_time_days')
         quantity = self.negotiation_state.get("quantity") or 1
 
-        import random
         order_number = f"ORD-{random.randint(100000, 999999)}"
 
         return {
@@ -329,7 +698,6 @@ Please confirm (YES) or make adjustments (NO)"""
         Returns:
             Formatted delivery date string
         """
-        from datetime import datetime, timedelta
         delivery_date = datetime.now() + timedelta(days=lead_time_days)
         return delivery_date.strftime("%Y-%m-%d")
 
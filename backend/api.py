@@ -6,18 +6,24 @@ Provides REST API endpoints for the procurement agent system.
 
 import sys
 import os
+import json
+from datetime import date
 from pathlib import Path
 from typing import Optional, Dict, List
 
 from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel, Field
 
 # Import from new modular structure
 from backend.core.catalog import Catalog
+from backend.core.plan_cache import PlanCache
 from backend.core.procurement import plan_procurement
 from backend.agents.cost_optimization_agent import CostOptimizationAgent
 from backend.agents.negotiation_agent import NegotiationAgent
+from backend.services.llm_service import CachedLLMProvider
+from backend.services.response_cache import PromptResponseCache, SemanticResponseCache
 
 # Initialize FastAPI app
 app = FastAPI(
@@ -44,6 +50,26 @@ catalog = Catalog(str(catalog_path), enable_embeddings=enable_embeddings, api_ke
 # Session management for stateful agents (e.g., negotiation agent)
 negotiation_sessions: Dict[str, NegotiationAgent] = {}
 
+# Optional semantic cache for vendor replies, shared by all negotiation sessions
+enable_response_cache = os.getenv("ENABLE_RESPONSE_CACHE", "false").lower() == "true"
+response_cache = None
+if enable_response_cache and catalog.embedding_manager:
+    response_cache = SemanticResponseCache(catalog.embedding_manager.embed_text)
+
+# Optional exact-prompt cache for LLM responses, shared by all agents
+enable_prompt_cache = os.getenv("ENABLE_PROMPT_CACHE", "false").lower() == "true"
+prompt_cache = PromptResponseCache() if enable_prompt_cache else None
+
+# Optional cache of procurement plans for repeated identical mock-LLM requests
+enable_plan_cache = os.getenv("ENABLE_PLAN_CACHE", "false").lower() == "true"
+plan_cache = PlanCache() if enable_plan_cache else None
+
+
+def _attach_prompt_cache(agent) -> None:
+    """Route an agent's LLM calls through the shared prompt cache, if enabled."""
+    if prompt_cache is not None and agent.llm is not None:
+        agent.llm = CachedLLMProvider(agent.llm, prompt_cache)
+
 
 # ============================================================================
 # REQUEST/RESPONSE MODELS
@@ -216,6 +242,22 @@ async def get_catalog_items(component: Optional[str] = None):
         raise HTTPException(status_code=500, detail=f"Failed to fetch items: {str(e)}")
 
 
+def _plan_cache_key(request_dict: dict, request: ProcurementRequest) -> Optional[str]:
+    """Return the plan cache key for a request, or None if its plan must not be cached."""
+    # Only the mock provider is deterministic; real LLM justifications are never replayed
+    if plan_cache is None or request.llm_provider.lower() != "mock":
+        return None
+    # Editing catalog.json invalidates plans; tool price histories are dated relative to
+    # today, so investigated plans expire daily
+    return PlanCache.make_key(
+        request_dict,
+        top_k=request.top_k,
+        investigate=request.investigate,
+        catalog_version=os.stat(catalog_path).st_mtime_ns,
+        day=date.today() if request.investigate else None
+    )
+
+
 @app.post("/api/procurement")
 async def run_procurement(request: ProcurementRequest):
     """
@@ -243,14 +285,19 @@ async def run_procurement(request: ProcurementRequest):
                 detail="OpenAI API key required. Set OPENAI_API_KEY environment variable or provide api_key in request"
             )
 
-        # Run procurement
-        result = plan_procurement(
-            request=request_dict,
-            top_k=request.top_k,
-            investigate=request.investigate,
-            llm_provider=request.llm_provider,
-            api_key=api_key_to_use
-        )
+        # Run procurement (a cached plan is returned unchanged, metrics included)
+        cache_key = _plan_cache_key(request_dict, request)
+        result = plan_cache.get(cache_key) if cache_key is not None else None
+        if result is None:
+            result = plan_procurement(
+                request=request_dict,
+                top_k=request.top_k,
+                investigate=request.investigate,
+                llm_provider=request.llm_provider,
+                api_key=api_key_to_use
+            )
+            if cache_key is not None and "error" not in result:
+                plan_cache.put(cache_key, result)
 
         # Check for errors
         if "error" in result:
@@ -292,7 +339,8 @@ async def start_negotiation(request: AnalysisRequest):
         agent = NegotiationAgent(
             llm_provider="openai",
             api_key=api_key_to_use,
-            catalog=catalog
+            catalog=catalog,
+            response_cache=response_cache
         )
 
         # Check if LLM initialization failed
@@ -302,11 +350,14 @@ async def start_negotiation(request: AnalysisRequest):
                 detail="Failed to initialize OpenAI. Please check API key."
             )
 
+        # Serve repeated prompts from the shared cache (if enabled)
+        _attach_prompt_cache(agent)
+
         # Store agent in session
         negotiation_sessions[session_id] = agent
 
         # Start negotiation
-        result = agent.start_negotiation(
+        result = await agent.astart_negotiation(
             selected_item=request.selected_item,
             request=request.request
         )
@@ -352,7 +403,7 @@ async def negotiate_chat(request: ChatRequest):
         agent = negotiation_sessions[request.session_id]
 
         # Get vendor response with full context
-        response = agent.respond_to_offer(
+        response = await agent.arespond_to_offer(
             request.user_message,
             request.conversation,
             request=request.request
@@ -368,6 +419,44 @@ async def negotiate_chat(request: ChatRequest):
         raise HTTPException(status_code=500, detail=f"Negotiation chat failed: {str(e)}")
 
 
+@app.post("/api/negotiate/chat/stream")
+async def negotiate_chat_stream(request: ChatRequest):
+    """
+    Streaming variant of /api/negotiate/chat.
+
+    Returns newline-delimited JSON: token events as the vendor reply is generated,
+    followed by one final event with the same fields as the non-streaming endpoint.
+    """
+    if not request.session_id:
+        raise HTTPException(
+            status_code=400,
+            detail="session_id is required for negotiation chat"
+        )
+
+    if request.session_id not in negotiation_sessions:
+        raise HTTPException(
+            status_code=400,
+            detail="Invalid session ID. Please start a new negotiation."
+        )
+
+    agent = negotiation_sessions[request.session_id]
+
+    async def event_lines():
+        try:
+            async for event in agent.astream_response_to_offer(
+                request.user_message,
+                request.conversation,
+                request=request.request
+            ):
+                if event["type"] == "final":
+                    event["session_id"] = request.session_id
+                yield json.dumps(event, default=str) + "\n"
+        except Exception as e:
+            yield json.dumps({"type": "error", "detail": f"Negotiation chat failed: {str(e)}"}) + "\n"
+
+    return StreamingResponse(event_lines(), media_type="application/x-ndjson")
+
+
 @app.post("/api/cost-optimize/start")
 async def start_cost_optimization(request: AnalysisRequest):
     """
@@ -398,6 +487,9 @@ async def start_cost_optimization(request: AnalysisRequest):
                 detail="Failed to initialize OpenAI. Please check API key."
             )
 
+        # Serve repeated prompts from the shared cache (if enabled)
+        _attach_prompt_cache(agent)
+
         # Get initial analysis
         result = agent.analyze_costs(
             selected_item=request.selected_item,
@@ -446,6 +538,9 @@ async def cost_optimize_chat(request: ChatRequest):
                 detail="Failed to initialize OpenAI. Please check API key."
             )
 
+        # Serve repeated prompts from the shared cache (if enabled)
+        _attach_prompt_cache(agent)
+
         # Get agent response with full context
         response = agent.chat(
             request.user_message,
@@ -6,12 +6,14 @@ Exports:
   - EmbeddingManager: Vector embeddings management
   - LLMAdapter: LLM abstraction interface
   - Procurement functions: plan_procurement, negotiate_procurement
+  - PlanCache: LRU of procurement plans for repeated requests
 """
 
 from backend.core.catalog import Catalog
 from backend.core.embeddings import EmbeddingManager
 from backend.core.llm_adapter import LLMAdapter, MockLLM, OpenAILLM, select_llm_provider
-from backend.core.procurement import plan_procurement, negotiate_procurement, compute_score
+from backend.core.plan_cache import PlanCache
+from backend.core.procurement import plan_procurement, negotiate_procurement, compute_score, compute_scores_vec
 
 __all__ = [
     "Catalog",
@@ -19,8 +21,10 @@ __all__ = [
     "LLMAdapter",
     "MockLLM",
     "OpenAILLM",
+    "PlanCache",
     "select_llm_provider",
     "plan_procurement",
     "negotiate_procurement",
-    "compute_score"
+    "compute_score",
+    "compute_scores_vec"
 ]
@@ -12,7 +12,13 @@ Key exports:
 import json
 import hashlib
 from typing import List, Set, Dict, Union, Optional
-from backend.core.embeddings import EmbeddingManager
+import numpy as np
+from backend.core.embeddings import EmbeddingIndex, EmbeddingManager
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 
 class Catalog:
@@ -32,18 +38,54 @@ class Catalog:
             enable_embeddings: Whether to enable vector embeddings
             api_key: Optional OpenAI API key for embeddings
         """
-        with open(catalog_path, 'r') as f:
-            self.items = json.load(f)
+        with open(catalog_path, 'rb') as f:
+            catalog_bytes = f.read()
+        # orjson parses the raw bytes directly; stdlib json is the fallback
+        self.items = orjson.loads(catalog_bytes) if orjson is not None else json.loads(catalog_bytes)
 
         self.embedding_manager = None
+        self._embedding_index = None
+        self._embedding_rows = []
         if enable_embeddings:
             try:
                 self.embedding_manager = EmbeddingManager(api_key=api_key)
-                # Generate embeddings for all items if not cached
-                self.items = self.embedding_manager.embed_items(self.items)
+                self._attach_embeddings(catalog_bytes)
             except Exception as e:
                 print(f"Warning: Could not initialize embeddings: {e}")
 
+        # Scoring attributes as parallel arrays (row i describes self.items[i]) so
+        # candidates can be scored by index without per-item dict lookups
+        self.prices = np.array([item.get("price", 0) for item in self.items])
+        self.lead_times = np.array([item.get("lead_time_days", 0) for item in self.items])
+        self.reliabilities = np.array([item.get("reliability", 0) for item in self.items], dtype=np.float64)
+
+        # Row indices per component type, so a search only visits its own bucket
+        self._by_component: Dict[str, List[int]] = {}
+        for index, item in enumerate(self.items):
+            self._by_component.setdefault(item.get("component"), []).append(index)
+
+    def _attach_embeddings(self, catalog_bytes: bytes):
+        """
+        Give every item an 'embedding', reusing the saved matrix for this exact catalog when present.
+
+        Args:
+            catalog_bytes: Raw contents of the catalog file
+        """
+        matrix = self.embedding_manager.load_catalog_matrix(catalog_bytes)
+        if matrix is not None and len(matrix) == len(self.items):
+            self.items = [dict(item, embedding=row.tolist()) for item, row in zip(self.items, matrix)]
+        else:
+            # Generate embeddings for all items if not cached
+            self.items = self.embedding_manager.embed_items(self.items)
+            if self.items and all('embedding' in item for item in self.items):
+                matrix = np.array([item['embedding'] for item in self.items])
+                self.embedding_manager.save_catalog_matrix(catalog_bytes, matrix)
+
+        # Index the embedded items once so semantic search is one inner-product call per query
+        self._embedding_rows = [i for i, item in enumerate(self.items) if 'embedding' in item]
+        if self._embedding_rows:
+            self._embedding_index = EmbeddingIndex([self.items[i]['embedding'] for i in self._embedding_rows])
+
     def search(self, component: str, spec_filters: Dict[str, Union[int, float]] = None) -> List[Dict]:
         """
         Search for items by component type and optional spec filters.
@@ -55,31 +97,41 @@ class Catalog:
                          Example: {"power_w": 140} returns items with power_w >= 140
 
         Returns:
-            List of matching item dicts
+            List of matching item dicts (copies, so callers may annotate them freely)
         """
-        results = []
+        return [dict(self.items[i]) for i in self.search_indices(component, spec_filters)]
 
-        for item in self.items:
-            # Check component type match
-            if item.get("component") != component:
-                continue
+    def search_indices(self, component: str, spec_filters: Dict[str, Union[int, float]] = None) -> List[int]:
+        """
+        Search like search(), returning row indices into self.items and the attribute arrays.
+
+        Args:
+            component: Component type to search for (e.g., "solar_panel")
+            spec_filters: Optional dict of numeric spec constraints (items must have specs >= values)
 
-            # Check spec filters if provided
-            if spec_filters:
-                specs = item.get("specs", {})
-                matches_all = True
+        Returns:
+            List of indices of matching items, in catalog order
+        """
+        # Component type match is a bucket lookup
+        bucket = self._by_component.get(component, [])
+        if not spec_filters:
+            return list(bucket)
+
+        results = []
 
-                for spec_key, min_value in spec_filters.items():
-                    item_value = specs.get(spec_key)
-                    # Item must have the spec and it must be >= filter value
-                    if item_value is None or item_value < min_value:
-                        matches_all = False
-                        break
+        for index in bucket:
+            specs = self.items[index].get("specs", {})
+            matches_all = True
 
-                if not matches_all:
-                    continue
+            for spec_key, min_value in spec_filters.items():
+                item_value = specs.get(spec_key)
+                # Item must have the spec and it must be >= filter value
+                if item_value is None or item_value < min_value:
+                    matches_all = False
+                    break
 
-            results.append(item)
+            if matches_all:
+                results.append(index)
 
         return results
 
@@ -160,6 +212,9 @@ class Catalog:
             List of items sorted by semantic similarity
         """
         # Use embedding manager if available
+        if self.embedding_manager and self._embedding_index is not None:
+            results = self.embedding_manager.search_index(query, self._embedding_index, top_k=top_k)
+            return [self.items[self._embedding_rows[row]] for row, score in results]
         if self.embedding_manager:
             results = self.embedding_manager.semantic_search(query, self.items, top_k=top_k)
             return [item for item, score in results]
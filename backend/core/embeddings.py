@@ -3,17 +3,91 @@ Vector Embeddings Module - Manages semantic embeddings for catalog items and que
 
 Provides:
 - Embedding generation using OpenAI API
-- Embedding caching to avoid repeated API calls
-- Semantic similarity search using cosine similarity
+- Embedding caching to avoid repeated API calls (per text, plus a per-catalog .npy matrix)
+- Semantic similarity search using cosine similarity (EmbeddingIndex: FAISS or NumPy inner product)
 - Integration with catalog for smart component discovery
 """
 
+import functools
+import hashlib
 import json
 import os
 from typing import List, Dict, Optional, Tuple
 from pathlib import Path
 import numpy as np
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import faiss
+except ImportError:
+    faiss = None
+
+
+EMBEDDING_MODEL = "text-embedding-3-small"
+
+
+@functools.lru_cache(maxsize=8)
+def _load_matrix(path: str, mtime_ns: int) -> np.ndarray:
+    """Memory-map a saved embedding matrix once per file version, shared by every Catalog in the process."""
+    return np.load(path, mmap_mode="r")
+
+
+class EmbeddingIndex:
+    """Exact cosine-similarity index over a fixed set of embeddings.
+
+    Rows are L2-normalized once so similarity is a single inner-product call per query:
+    a FAISS IndexFlatIP when faiss is installed, a NumPy matrix-vector product otherwise.
+    """
+
+    def __init__(self, matrix: np.ndarray):
+        """Build the index.
+
+        Args:
+            matrix: (n, dim) embedding matrix
+        """
+        vectors = np.array(matrix, dtype=np.float32)
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        self._vectors = vectors / norms
+        self._faiss_index = None
+        if faiss is not None:
+            self._faiss_index = faiss.IndexFlatIP(self._vectors.shape[1])
+            self._faiss_index.add(self._vectors)
+
+    def __len__(self) -> int:
+        return len(self._vectors)
+
+    def search(self, query: List[float], top_k: int, threshold: float = 0.0) -> List[Tuple[int, float]]:
+        """Return the rows most similar to a query vector.
+
+        Args:
+            query: Query embedding
+            top_k: Maximum number of results
+            threshold: Minimum cosine similarity
+
+        Returns:
+            List of (row, similarity) tuples, most similar first
+        """
+        vector = np.asarray(query, dtype=np.float32)
+        norm = np.linalg.norm(vector)
+        if norm == 0 or top_k <= 0 or not len(self._vectors):
+            return []
+        vector = vector / norm
+
+        if self._faiss_index is not None:
+            similarities, rows = self._faiss_index.search(vector[None, :], min(top_k, len(self._vectors)))
+            pairs = zip(rows[0].tolist(), similarities[0].tolist())
+        else:
+            similarities = self._vectors @ vector
+            rows = np.argsort(-similarities, kind="stable")[:top_k]
+            pairs = zip(rows.tolist(), similarities[rows].tolist())
+
+        return [(row, similarity) for row, similarity in pairs if row >= 0 and similarity >= threshold]
+
 
 class EmbeddingManager:
     """Manages embeddings for catalog items and semantic search."""
@@ -36,8 +110,11 @@ class EmbeddingManager:
         cache_file = self.cache_dir / "embeddings.json"
         if cache_file.exists():
             try:
-                with open(cache_file, 'r') as f:
-                    self.embeddings_cache = json.load(f)
+                if orjson is not None:
+                    self.embeddings_cache = orjson.loads(cache_file.read_bytes())
+                else:
+                    with open(cache_file, 'r') as f:
+                        self.embeddings_cache = json.load(f)
             except Exception as e:
                 print(f"Warning: Could not load embeddings cache: {e}")
 
@@ -45,17 +122,22 @@ class EmbeddingManager:
         """Save embeddings cache to disk."""
         try:
             cache_file = self.cache_dir / "embeddings.json"
-            with open(cache_file, 'w') as f:
-                json.dump(self.embeddings_cache, f)
+            if orjson is not None:
+                # orjson serializes the float vectors in C and writes bytes directly
+                cache_file.write_bytes(orjson.dumps(self.embeddings_cache))
+            else:
+                with open(cache_file, 'w') as f:
+                    json.dump(self.embeddings_cache, f)
         except Exception as e:
             print(f"Warning: Could not save embeddings cache: {e}")
 
-    def _get_embedding(self, text: str, use_cache: bool = True) -> Optional[List[float]]:
+    def _get_embedding(self, text: str, use_cache: bool = True, persist: bool = True) -> Optional[List[float]]:
         """Get embedding for text, using cache if available.
 
         Args:
             text: Text to embed
             use_cache: Whether to use cached embeddings
+            persist: Whether to store a newly generated embedding in the cache
 
         Returns:
             Embedding vector or None if API not available
@@ -74,21 +156,66 @@ class EmbeddingManager:
 
             client = OpenAI(api_key=self.api_key)
             response = client.embeddings.create(
-                model="text-embedding-3-small",
+                model=EMBEDDING_MODEL,
                 input=text
             )
 
             embedding = response.data[0].embedding
 
             # Cache the embedding
-            self.embeddings_cache[text] = embedding
-            self._save_cache()
+            if persist:
+                self.embeddings_cache[text] = embedding
+                self._save_cache()
 
             return embedding
         except Exception as e:
             print(f"Warning: Could not generate embedding: {e}")
             return None
 
+    def _matrix_path(self, catalog_bytes: bytes) -> Path:
+        """Path of the saved embedding matrix for a catalog file's contents and the embedding model."""
+        digest = hashlib.sha1(catalog_bytes + EMBEDDING_MODEL.encode()).hexdigest()
+        return self.cache_dir / f"catalog_{digest}.npy"
+
+    def load_catalog_matrix(self, catalog_bytes: bytes) -> Optional[np.ndarray]:
+        """Load the saved item embedding matrix for a catalog, if one exists.
+
+        Args:
+            catalog_bytes: Raw contents of the catalog file (the cache key)
+
+        Returns:
+            Read-only (n_items, dim) array, or None if the catalog has not been embedded yet
+        """
+        path = self._matrix_path(catalog_bytes)
+        try:
+            return _load_matrix(str(path), path.stat().st_mtime_ns)
+        except (OSError, ValueError, EOFError):
+            # Missing, truncated or corrupt file: the caller re-embeds and overwrites it
+            return None
+
+    def save_catalog_matrix(self, catalog_bytes: bytes, matrix: np.ndarray):
+        """Save the item embedding matrix for a catalog so later loads skip embedding entirely.
+
+        Args:
+            catalog_bytes: Raw contents of the catalog file (the cache key)
+            matrix: (n_items, dim) embedding matrix, rows in catalog order
+        """
+        try:
+            np.save(self._matrix_path(catalog_bytes), np.asarray(matrix, dtype=np.float64))
+        except Exception as e:
+            print(f"Warning: Could not save embedding matrix: {e}")
+
+    def embed_text(self, text: str) -> Optional[List[float]]:
+        """Embed free text (e.g. a chat message) without persisting it to the disk cache.
+
+        Args:
+            text: Text to embed
+
+        Returns:
+            Embedding vector or None if API not available
+        """
+        return self._get_embedding(text, persist=False)
+
     def embed_items(self, items: List[Dict], key: str = "description") -> List[Dict]:
         """Generate embeddings for a list of items.
 
@@ -183,6 +310,32 @@ class EmbeddingManager:
 
         return results[:top_k]
 
+    def search_index(
+        self,
+        query: str,
+        index: EmbeddingIndex,
+        top_k: int = 5,
+        threshold: float = 0.5
+    ) -> List[Tuple[int, float]]:
+        """Semantic search against a prebuilt EmbeddingIndex (same results as semantic_search).
+
+        Args:
+            query: Search query
+            index: Index over the item embeddings
+            top_k: Number of top results to return
+            threshold: Minimum similarity score (0-1)
+
+        Returns:
+            List of (index row, similarity_score) tuples, sorted by similarity
+        """
+        query_embedding = self._get_embedding(query)
+
+        if not query_embedding:
+            # Fallback to empty results if embeddings not available
+            return []
+
+        return index.search(query_embedding, top_k, threshold=threshold)
+
     def find_similar_items(
         self,
         item: Dict,
@@ -14,6 +14,11 @@ Key exports:
 from abc import ABC, abstractmethod
 import re
 
+
+# First integer in a prompt line (price / lead time values)
+_RE_NUMBER = re.compile(r'\d+')
+
+
 class LLMAdapter(ABC):
     """
     Abstract base class for LLMAdapter. Contains one abstract method generate.
@@ -59,23 +64,24 @@ class MockLLM(LLMAdapter):
         # Weighted average (same as in procurement.py)
         return 0.4 * price_score + 0.3 * lead_score + 0.3 * reliability_score
 
-    def _extract_items_from_prompt(self, prompt: str) -> list:
+    def _extract_items_from_prompt(self, prompt: str, prompt_lower: str = None) -> list:
         """
         Extract all items from prompt (handles multiple items).
 
         Args:
             prompt: The prompt string
+            prompt_lower: Optional pre-lowered copy of the prompt (avoids re-lowering each line)
 
         Returns:
             List of item dicts with extracted details
         """
+        if prompt_lower is None:
+            prompt_lower = prompt.lower()
+
         items = []
-        lines = prompt.split('\n')
         current_item = {}
 
-        for line in lines:
-            line_lower = line.lower()
-
+        for line, line_lower in zip(prompt.split('\n'), prompt_lower.split('\n')):
             if "id:" in line_lower:
                 # New item detected
                 if current_item:
@@ -93,16 +99,13 @@ class MockLLM(LLMAdapter):
             if "price:" in line_lower:
                 parts = line.split(':')
                 if len(parts) > 1:
-                    price_str = parts[1].strip()
-                    try:
-                        current_item['price'] = float(re.findall(r'\d+', price_str)[0])
-                    except (IndexError, ValueError):
-                        current_item['price'] = 0
+                    match = _RE_NUMBER.search(parts[1])
+                    current_item['price'] = float(match.group()) if match else 0
 
             if "lead_time" in line_lower or "delivery" in line_lower:
-                numbers = re.findall(r'\d+', line)
-                if numbers:
-                    current_item['lead_time'] = float(numbers[0])
+                match = _RE_NUMBER.search(line)
+                if match:
+                    current_item['lead_time'] = float(match.group())
 
             if "reliability:" in line_lower:
                 parts = line.split(':')
@@ -141,7 +144,7 @@ class MockLLM(LLMAdapter):
 
         # Check if this is a decision/selection prompt
         if "choose between" in prompt_lower or "selected" in prompt_lower:
-            items = self._extract_items_from_prompt(prompt)
+            items = self._extract_items_from_prompt(prompt, prompt_lower)
             if items:
                 return self._generate_selection_justification(items)
             return "Unable to parse items from prompt."
@@ -196,31 +199,23 @@ class MockLLM(LLMAdapter):
         if not best_item:
             return "Unable to determine best item."
 
-        # Generate justification for selected item
-        item_id = best_item.get('id', 'Unknown')
-        vendor = best_item.get('vendor', 'Unknown')
-        price = best_item.get('price')
-        lead_time = best_item.get('lead_time')
-        reliability = best_item.get('reliability')
-
-        # Build response
-        response = f"Selected {item_id} from {vendor}."
-        justification = "It balances"
-        factors = []
-        if price:
-            factors.append(f"cost ({int(price)})")
-        if lead_time:
-            factors.append(f"delivery ({int(lead_time)} days)")
-        if reliability:
-            factors.append(f"strong reliability ({reliability})")
+        # Generate justification for selected item (single lookup per field)
+        get = best_item.get
+        item_id, vendor = get('id', 'Unknown'), get('vendor', 'Unknown')
+        price, lead_time, reliability = get('price'), get('lead_time'), get('reliability')
+
+        factors = " and ".join(factor for factor in (
+            price and f"cost ({int(price)})",
+            lead_time and f"delivery ({int(lead_time)} days)",
+            reliability and f"strong reliability ({reliability})",
+        ) if factor)
 
         if factors:
-            justification += " " + " and ".join(factors)
-            justification += ", making it the best fit for the request."
+            justification = f"It balances {factors}, making it the best fit for the request."
         else:
             justification = "It provides the best balance of price, delivery time, and reliability for the requirements."
 
-        return response + " " + justification
+        return f"Selected {item_id} from {vendor}. {justification}"
 
 
 class OpenAILLM(LLMAdapter):
@@ -235,6 +230,7 @@ class OpenAILLM(LLMAdapter):
         """
         self.api_key = api_key
         self.model = model
+        self._client = None
 
     def generate(self, prompt: str, max_tokens: int = 150) -> str:
         """Generate response using OpenAI API.
@@ -247,11 +243,13 @@ class OpenAILLM(LLMAdapter):
             Generated text response
         """
         try:
-            from openai import OpenAI
+            if self._client is None:
+                from openai import OpenAI
 
-            client = OpenAI(api_key=self.api_key)
+                # Created once and reused, so the HTTP connection pool survives across calls
+                self._client = OpenAI(api_key=self.api_key)
 
-            response = client.chat.completions.create(
+            response = self._client.chat.completions.create(
                 model=self.model,
                 messages=[
                     {"role": "system", "content": "You are a procurement expert helping to justify component selection decisions."},
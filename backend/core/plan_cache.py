@@ -0,0 +1,68 @@
+"""
+Plan Cache - Memoizes procurement plans for repeated requests.
+
+Identical requests (same request dict, options, and catalog version) are answered from
+an in-process LRU instead of re-running search, scoring, tools, and the LLM.
+
+Key exports:
+  - PlanCache: Thread-safe LRU of plan results
+"""
+
+import copy
+import json
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+
+class PlanCache:
+    """Thread-safe LRU cache of plan_procurement results.
+
+    Results are deep-copied on the way in and out, so callers may modify what they get back.
+    """
+
+    def __init__(self, max_entries: int = 128):
+        """Initialize the cache.
+
+        Args:
+            max_entries: Results kept (least recently used evicted first)
+        """
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, dict]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def make_key(request: dict, **options: Any) -> str:
+        """Build a canonical key from the request dict and the options that affect the result."""
+        return json.dumps([request, options], sort_keys=True, default=str)
+
+    def get(self, key: str) -> Optional[dict]:
+        """Return a copy of the cached result for key, or None on a miss."""
+        with self._lock:
+            result = self._entries.get(key)
+            if result is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+        return copy.deepcopy(result)
+
+    def put(self, key: str, result: dict) -> None:
+        """Store a copy of a result, evicting the least recently used entry when full."""
+        result = copy.deepcopy(result)
+        with self._lock:
+            self._entries[key] = result
+            self._entries.move_to_end(key)
+            if len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """Drop every cached result."""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, int]:
+        """Return hit/miss counters."""
+        return {"hits": self.hits, "misses": self.misses, "entries": len(self._entries)}
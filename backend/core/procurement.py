@@ -10,19 +10,90 @@ Key exports:
   - negotiate_procurement(): Multi-agent negotiation simulation
   - run_flow(): LangGraph orchestration with fallback
   - compute_score(): Candidate scoring function
+  - compute_scores_vec(): Vectorized scoring over arrays of candidate attributes
   - price_history_tool(), availability_tool(): Deterministic tool implementations
 """
 
+import os
 import json
 import time
+import functools
 import random
-import hashlib
-from datetime import datetime, timedelta
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime, timedelta
 from typing import List, Dict, Set, Optional, Union
+import numpy as np
 from backend.core.catalog import Catalog
 from backend.core.llm_adapter import LLMAdapter, MockLLM, select_llm_provider
 
 
+# ============================================================================
+# CATALOG LOADING
+# ============================================================================
+
+_CATALOG_PATH = "catalog.json"
+
+
+@functools.lru_cache(maxsize=4)
+def _get_catalog(path: str, mtime: int) -> Catalog:
+    """
+    Load a catalog once per file version.
+
+    The file's modification time is part of the cache key, so editing the catalog
+    on disk transparently triggers a reload on the next request.
+
+    Args:
+        path: Path to the catalog JSON file
+        mtime: File modification time in nanoseconds (os.stat().st_mtime_ns)
+
+    Returns:
+        Shared Catalog instance (callers must not mutate its items)
+    """
+    return Catalog(path)
+
+
+# ============================================================================
+# PROMPTS
+# ============================================================================
+
+_JUSTIFICATION_PROMPT = """Selected item details:
+ID: {id}
+Vendor: {vendor}
+Price: {price}
+Lead Time: {lead_time_days} days
+Reliability: {reliability}
+
+Request constraints:
+Max Cost: {max_cost}
+Latest Delivery: {latest_delivery_days} days
+
+Please provide a brief justification (2-3 sentences) for why this item is the best choice.
+"""
+
+
+def _build_justification_prompt(selected: dict, request: dict) -> str:
+    """
+    Fill the justification prompt template for the selected item.
+
+    Args:
+        selected: Selected catalog item
+        request: Original request dict
+
+    Returns:
+        Prompt string for the LLM
+    """
+    return _JUSTIFICATION_PROMPT.format(
+        id=selected['id'],
+        vendor=selected['vendor'],
+        price=selected['price'],
+        lead_time_days=selected['lead_time_days'],
+        reliability=selected['reliability'],
+        max_cost=request.get('max_cost', 'N/A'),
+        latest_delivery_days=request.get('latest_delivery_days', 'N/A')
+    )
+
+
 # ============================================================================
 # SCORING FUNCTIONS
 # ============================================================================
@@ -75,45 +146,139 @@ def compute_score(item: dict, request: dict, price_min: float, price_max: float,
     return max(0.0, min(1.0, score))
 
 
+def compute_scores_vec(prices: np.ndarray, lead_times: np.ndarray, reliabilities: np.ndarray, request: dict,
+                       price_min: Optional[float] = None, price_max: Optional[float] = None,
+                       lead_min: Optional[float] = None, lead_max: Optional[float] = None) -> np.ndarray:
+    """
+    Vectorized compute_score: score every candidate in one pass over attribute arrays.
+
+    Produces the same values as calling compute_score on each item, with the same
+    weights, normalization, and clamping.
+
+    Args:
+        prices: Candidate prices
+        lead_times: Candidate lead times in days
+        reliabilities: Candidate reliability scores
+        request: Request dict that may contain "weights" mapping criteria to weights
+        price_min: Minimum price for normalization (defaults to prices.min())
+        price_max: Maximum price for normalization (defaults to prices.max())
+        lead_min: Minimum lead time for normalization (defaults to lead_times.min())
+        lead_max: Maximum lead time for normalization (defaults to lead_times.max())
+
+    Returns:
+        Float64 array of scores in [0, 1], aligned with the inputs
+    """
+    default_weights = {"price": 0.4, "lead_time": 0.3, "reliability": 0.3}
+    weights = request.get("weights", default_weights)
+
+    prices = np.asarray(prices, dtype=np.float64)
+    lead_times = np.asarray(lead_times, dtype=np.float64)
+    reliabilities = np.asarray(reliabilities, dtype=np.float64)
+    if len(prices) == 0:
+        return np.empty(0, dtype=np.float64)
+
+    price_min = prices.min() if price_min is None else price_min
+    price_max = prices.max() if price_max is None else price_max
+    lead_min = lead_times.min() if lead_min is None else lead_min
+    lead_max = lead_times.max() if lead_max is None else lead_max
+
+    price_weight = weights.get("price", default_weights["price"])
+    lead_time_weight = weights.get("lead_time", default_weights["lead_time"])
+    reliability_weight = weights.get("reliability", default_weights["reliability"])
+
+    # Normalize price and lead time (lower is better, so invert); a degenerate range
+    # contributes the constant 1.0 without touching the arrays
+    if price_max == price_min:
+        normalized_price = 1.0
+    else:
+        normalized_price = np.clip(1 - (prices - price_min) / (price_max - price_min), 0.0, 1.0)
+
+    if lead_max == lead_min:
+        normalized_lead_time = 1.0
+    else:
+        normalized_lead_time = np.clip(1 - (lead_times - lead_min) / (lead_max - lead_min), 0.0, 1.0)
+
+    scores = (
+        price_weight * normalized_price +
+        lead_time_weight * normalized_lead_time +
+        reliability_weight * reliabilities
+    )
+
+    return np.clip(scores, 0.0, 1.0)
+
+
 # ============================================================================
 # TOOL FUNCTIONS
 # ============================================================================
 
-def price_history_tool(item_id: str) -> dict:
+# Below this many candidates the tools run inline: they are memoized and CPU-bound,
+# so thread hand-off costs more than it overlaps
+_PARALLEL_TOOLS_MIN_CANDIDATES = 8
+
+
+def _seed_from_str(text: str) -> int:
     """
-    Return deterministic price history for an item.
+    Derive a deterministic 64-bit seed from a string.
+
+    CRC32 spread over 64 bits with the golden-ratio multiplier (as in splitmix64);
+    stable across processes, unlike the builtin hash().
 
     Args:
-        item_id: The item ID (e.g., "SP-100")
+        text: String to derive the seed from
 
     Returns:
-        Dict containing item_id and history with date/price pairs
+        Non-negative integer below 2**64
+    """
+    return ((zlib.crc32(text.encode()) & 0xFFFFFFFF) * 0x9E3779B97F4A7C15) & 0xFFFFFFFFFFFFFFFF
+
+
+@functools.lru_cache(maxsize=1024)
+def _price_history_points(item_id: str, today: date) -> tuple:
+    """
+    Compute the (date, price) points behind price_history_tool, memoized per item and day.
+
+    Args:
+        item_id: The item ID
+        today: Current date (part of the key so the history rolls over at midnight)
+
+    Returns:
+        Tuple of (date string, price) pairs, oldest first
     """
     # Use hash of item_id to generate deterministic base price
-    hash_val = int(hashlib.md5(item_id.encode()).hexdigest(), 16)
-    random.seed(hash_val)
+    hash_val = _seed_from_str(item_id)
 
     # Generate base price from hash
     base_price = 1000 + (hash_val % 10000)
 
-    # Generate 4 historical data points
-    history = []
-    current_date = datetime.now()
+    # Private generator: no global random state to reseed or guard across threads
+    rng = random.Random(hash_val)
 
+    points = []
     for i in range(4):
         # Go back in time
-        date = current_date - timedelta(days=30 * (4 - i))
+        point_date = today - timedelta(days=30 * (4 - i))
         # Add some variation
-        price_variation = random.randint(-200, 200)
-        price = base_price + price_variation
+        price_variation = rng.randint(-200, 200)
+        points.append((point_date.strftime("%Y-%m-%d"), base_price + price_variation))
 
-        history.append({
-            "date": date.strftime("%Y-%m-%d"),
-            "price": price
-        })
+    return tuple(points)
 
-    # Reset random seed to avoid affecting other code
-    random.seed()
+
+def price_history_tool(item_id: str) -> dict:
+    """
+    Return deterministic price history for an item.
+
+    Args:
+        item_id: The item ID (e.g., "SP-100")
+
+    Returns:
+        Dict containing item_id and history with date/price pairs
+    """
+    # Generate 4 historical data points (fresh dicts, so callers may modify them)
+    history = [
+        {"date": point_date, "price": price}
+        for point_date, price in _price_history_points(item_id, datetime.now().date())
+    ]
 
     return {
         "item_id": item_id,
@@ -121,42 +286,197 @@ def price_history_tool(item_id: str) -> dict:
     }
 
 
-def availability_tool(vendor: str) -> dict:
+@functools.lru_cache(maxsize=1024)
+def _availability_values(vendor: str) -> tuple:
     """
-    Return deterministic availability information for a vendor.
+    Compute the values behind availability_tool, memoized per vendor.
 
     Args:
-        vendor: The vendor name (e.g., "Helios Dynamics")
+        vendor: The vendor name
 
     Returns:
-        Dict containing vendor, avg_lead_time_days, in_stock, and lead_time_samples
+        Tuple of (avg_lead_time_days, in_stock, lead_time_samples tuple)
     """
     # Use hash of vendor name to generate deterministic values
-    hash_val = int(hashlib.md5(vendor.encode()).hexdigest(), 16)
-    random.seed(hash_val)
+    hash_val = _seed_from_str(vendor)
 
     # Generate deterministic values
     avg_lead_time_days = 10 + (hash_val % 30)  # Between 10 and 40 days
     in_stock = (hash_val % 2) == 0  # Deterministically true or false
 
     # Generate 3 lead time samples
-    lead_time_samples = []
-    for i in range(3):
-        sample = avg_lead_time_days + random.randint(-5, 5)
-        lead_time_samples.append(max(1, sample))  # Ensure positive
+    rng = random.Random(hash_val)
+    lead_time_samples = tuple(
+        max(1, avg_lead_time_days + rng.randint(-5, 5))  # Ensure positive
+        for _ in range(3)
+    )
+
+    return avg_lead_time_days, in_stock, lead_time_samples
+
+
+def availability_tool(vendor: str) -> dict:
+    """
+    Return deterministic availability information for a vendor.
+
+    Args:
+        vendor: The vendor name (e.g., "Helios Dynamics")
 
-    # Reset random seed
-    random.seed()
+    Returns:
+        Dict containing vendor, avg_lead_time_days, in_stock, and lead_time_samples
+    """
+    avg_lead_time_days, in_stock, lead_time_samples = _availability_values(vendor)
 
     return {
         "vendor": vendor,
         "avg_lead_time_days": float(avg_lead_time_days),
         "in_stock": in_stock,
-        "lead_time_samples": lead_time_samples
+        "lead_time_samples": list(lead_time_samples)
     }
 
 
-def plan_procurement(request: dict, top_k: int = 3, investigate: bool = False, llm_provider: str = "mock", api_key: str = None) -> dict:
+@functools.lru_cache(maxsize=None)
+def _tool_executor() -> ThreadPoolExecutor:
+    """Create the shared pool for running investigation tools concurrently on first use."""
+    return ThreadPoolExecutor(max_workers=8, thread_name_prefix="procurement-tools")
+
+
+def _investigate_candidates(candidates: List[dict]) -> List[tuple]:
+    """
+    Run price_history_tool and availability_tool for every candidate (concurrently for large batches).
+
+    Args:
+        candidates: Candidates to investigate
+
+    Returns:
+        List of (price_history, availability) result pairs, aligned with candidates
+    """
+    if len(candidates) < _PARALLEL_TOOLS_MIN_CANDIDATES:
+        return [(price_history_tool(c["id"]), availability_tool(c["vendor"])) for c in candidates]
+
+    executor = _tool_executor()
+    price_futures = [executor.submit(price_history_tool, c["id"]) for c in candidates]
+    availability_futures = [executor.submit(availability_tool, c["vendor"]) for c in candidates]
+    return [
+        (price_future.result(), availability_future.result())
+        for price_future, availability_future in zip(price_futures, availability_futures)
+    ]
+
+
+def _load_catalog() -> Catalog:
+    """Return the shared catalog for the default catalog file (reloaded when the file changes)."""
+    return _get_catalog(_CATALOG_PATH, os.stat(_CATALOG_PATH).st_mtime_ns)
+
+
+def _filter_candidates(catalog: Catalog, indices: List[int], request: dict) -> tuple:
+    """
+    Apply the request's hard constraints and compute normalization bounds in one pass.
+
+    Args:
+        catalog: Catalog the indices refer to
+        indices: Catalog row indices from the search step
+        request: Request dict that may contain max_cost and latest_delivery_days
+
+    Returns:
+        Tuple of (surviving row indices, copied candidate dicts, (price_min, price_max, lead_min, lead_max))
+    """
+    max_cost = request.get("max_cost")
+    latest_delivery = request.get("latest_delivery_days")
+
+    inf = float('inf')
+    price_min = lead_min = inf
+    price_max = lead_max = -inf
+    survivors = []
+    candidates = []
+    for i in indices:
+        item = catalog.items[i]
+        if max_cost is not None and item.get("price", inf) > max_cost:
+            continue
+        if latest_delivery is not None and item.get("lead_time_days", inf) > latest_delivery:
+            continue
+        price = item.get("price", 0)
+        lead_time = item.get("lead_time_days", 0)
+        if price < price_min:
+            price_min = price
+        if price > price_max:
+            price_max = price
+        if lead_time < lead_min:
+            lead_min = lead_time
+        if lead_time > lead_max:
+            lead_max = lead_time
+        survivors.append(i)
+        # Copy the row: the catalog is shared across requests and candidates get annotated
+        candidates.append(dict(item))
+
+    return survivors, candidates, (price_min, price_max, lead_min, lead_max)
+
+
+def _score_and_rank(catalog: Catalog, survivors: List[int], candidates: List[dict], request: dict,
+                    bounds: tuple, top_k: int) -> List[dict]:
+    """
+    Score candidates in one vectorized pass and return the top_k.
+
+    Args:
+        catalog: Catalog the survivor indices refer to
+        survivors: Catalog row index of each candidate
+        candidates: Candidate dicts (annotated in place with "score")
+        request: Request dict that may contain "weights"
+        bounds: (price_min, price_max, lead_min, lead_max) for normalization
+        top_k: Number of top candidates to return
+
+    Returns:
+        Top candidates, best first (stable for ties, like a descending sort)
+    """
+    scores = compute_scores_vec(
+        catalog.prices[survivors],
+        catalog.lead_times[survivors],
+        catalog.reliabilities[survivors],
+        request, *bounds
+    )
+    for candidate, score in zip(candidates, scores.tolist()):
+        candidate["score"] = score
+
+    if len(candidates) <= top_k:
+        # Every candidate is selected; just order the (small) list
+        return sorted(candidates, key=lambda x: x.get("score", 0), reverse=True)
+    if top_k <= 0:
+        return []
+
+    # Partition around the k-th largest score, then order only the rows at or above it;
+    # ties keep catalog order, exactly like a stable descending sort
+    kth_score = np.partition(scores, len(scores) - top_k)[len(scores) - top_k]
+    rows = np.flatnonzero(scores >= kth_score)
+    rows = rows[np.argsort(-scores[rows], kind="stable")][:top_k]
+    return [candidates[row] for row in rows.tolist()]
+
+
+@functools.lru_cache(maxsize=8)
+def _get_llm(llm_provider: str, api_key: Optional[str]) -> Optional[LLMAdapter]:
+    """
+    Return a shared LLM adapter per provider and key, so clients are reused across requests.
+
+    Args:
+        llm_provider: Provider name ("mock", "openai", etc.)
+        api_key: Resolved API key (explicit or from the environment), part of the cache key
+
+    Returns:
+        LLMAdapter instance, or None if the provider requires a missing API key
+    """
+    return select_llm_provider(llm_provider, api_key=api_key)
+
+
+def _justify(selected: dict, request: dict, llm: LLMAdapter) -> str:
+    """Generate the LLM justification for the selected candidate."""
+    return llm.generate(_build_justification_prompt(selected, request), max_tokens=150)
+
+
+def _seconds_since(start_ns: int) -> float:
+    """Seconds elapsed since a time.perf_counter_ns() reading (integer arithmetic until the end)."""
+    return (time.perf_counter_ns() - start_ns) / 1e9
+
+
+def plan_procurement(request: dict, top_k: int = 3, investigate: bool = False, llm_provider: str = "mock", api_key: str = None,
+                     collect_metrics: bool = True, trace_enabled: bool = True,
+                     generate_justification: bool = True) -> dict:
     """
     Plan procurement by searching catalog, scoring candidates, and generating justification.
 
@@ -165,6 +485,10 @@ def plan_procurement(request: dict, top_k: int = 3, investigate: bool = False, l
         top_k: Number of top candidates to return
         investigate: Whether to call investigation tools
         llm_provider: LLM provider to use for justification
+        api_key: Optional API key for the LLM provider
+        collect_metrics: Whether to record per-step latencies (total_latency is always recorded)
+        trace_enabled: Whether to record trace entries (trace is returned empty otherwise)
+        generate_justification: Whether to ask the LLM for a justification (empty string otherwise)
 
     Returns:
         Result dict with request, candidates, selected, justification, trace, and metrics
@@ -179,48 +503,49 @@ def plan_procurement(request: dict, top_k: int = 3, investigate: bool = False, l
         "tools_called": 0,
         "total_latency": 0.0
     }
-    start_time = time.time()
+    start_time = time.perf_counter_ns()
 
     # Step 1: Load catalog and search
-    step_start = time.time()
+    step_start = time.perf_counter_ns()
     try:
-        catalog = Catalog("catalog.json")
-        metrics["step_latencies"]["catalog_load"] = time.time() - step_start
-        trace.append({"step": "catalog_load", "status": "success"})
+        catalog = _load_catalog()
+        if collect_metrics:
+            metrics["step_latencies"]["catalog_load"] = _seconds_since(step_start)
+        if trace_enabled:
+            trace.append({"step": "catalog_load", "status": "success"})
     except Exception as e:
-        metrics["total_latency"] = time.time() - start_time
+        metrics["total_latency"] = _seconds_since(start_time)
         return {"error": f"failed to load catalog: {str(e)}", "status": 500, "metrics": metrics}
 
     component = request.get("component")
     spec_filters = request.get("spec_filters")
 
     if not component:
-        metrics["total_latency"] = time.time() - start_time
+        metrics["total_latency"] = _seconds_since(start_time)
         return {"error": "no component specified", "status": 400, "metrics": metrics}
 
-    # Search for candidates
-    step_start = time.time()
-    candidates = catalog.search(component, spec_filters)
-    metrics["step_latencies"]["catalog_search"] = time.time() - step_start
-    metrics["total_candidates"] = len(candidates)
+    # Search for candidates (as catalog row indices, so scoring can read the attribute arrays)
+    step_start = time.perf_counter_ns()
+    indices = catalog.search_indices(component, spec_filters)
+    if collect_metrics:
+        metrics["step_latencies"]["catalog_search"] = _seconds_since(step_start)
+    metrics["total_candidates"] = len(indices)
 
-    trace.append({
-        "step": "catalog_search",
-        "input": {"component": component, "spec_filters": spec_filters},
-        "result": f"found {len(candidates)} candidates"
-    })
+    if trace_enabled:
+        trace.append({
+            "step": "catalog_search",
+            "input": {"component": component, "spec_filters": spec_filters},
+            "result": f"found {len(indices)} candidates"
+        })
 
-    # Step 2: Apply hard constraints (max_cost, latest_delivery_days)
-    initial_count = len(candidates)
+    # Step 2: Apply hard constraints (max_cost, latest_delivery_days) and track the
+    # normalization bounds of the survivors in the same pass
+    initial_count = len(indices)
     max_cost = request.get("max_cost")
     latest_delivery = request.get("latest_delivery_days")
+    survivors, candidates, bounds = _filter_candidates(catalog, indices, request)
 
-    if max_cost is not None:
-        candidates = [c for c in candidates if c.get("price", float('inf')) <= max_cost]
-    if latest_delivery is not None:
-        candidates = [c for c in candidates if c.get("lead_time_days", float('inf')) <= latest_delivery]
-
-    if initial_count > len(candidates):
+    if trace_enabled and initial_count > len(candidates):
         trace.append({
             "step": "constraint_filtering",
             "input": {"max_cost": max_cost, "latest_delivery_days": latest_delivery},
@@ -229,70 +554,66 @@ def plan_procurement(request: dict, top_k: int = 3, investigate: bool = False, l
 
     # Step 3: Check if candidates found
     if not candidates:
-        metrics["total_latency"] = time.time() - start_time
+        metrics["total_latency"] = _seconds_since(start_time)
         return {"error": "no candidates match constraints", "status": 404, "trace": trace, "metrics": metrics}
 
-    # Step 3: Compute min/max for normalization
-    step_start = time.time()
-    prices = [item.get("price", 0) for item in candidates]
-    lead_times = [item.get("lead_time_days", 0) for item in candidates]
+    # Step 3: Record min/max for normalization
+    step_start = time.perf_counter_ns()
+    price_min, price_max, lead_min, lead_max = bounds
 
-    price_min = min(prices)
-    price_max = max(prices)
-    lead_min = min(lead_times)
-    lead_max = max(lead_times)
-
-    trace.append({
-        "step": "compute_bounds",
-        "result": f"price: [{price_min}, {price_max}], lead_time: [{lead_min}, {lead_max}]"
-    })
+    if trace_enabled:
+        trace.append({
+            "step": "compute_bounds",
+            "result": f"price: [{price_min}, {price_max}], lead_time: [{lead_min}, {lead_max}]"
+        })
 
-    # Step 4: Score each candidate
-    for candidate in candidates:
-        score = compute_score(candidate, request, price_min, price_max, lead_min, lead_max)
-        candidate["score"] = score
+    # Step 4: Score all candidates in one vectorized pass, keeping the top_k
+    top_candidates = _score_and_rank(catalog, survivors, candidates, request, bounds, top_k)
 
-    metrics["step_latencies"]["scoring"] = time.time() - step_start
+    if collect_metrics:
+        metrics["step_latencies"]["scoring"] = _seconds_since(step_start)
     metrics["candidates_after_filtering"] = len(candidates)
 
-    trace.append({
-        "step": "scoring",
-        "result": f"scored {len(candidates)} candidates"
-    })
+    if trace_enabled:
+        trace.append({
+            "step": "scoring",
+            "result": f"scored {len(candidates)} candidates"
+        })
 
-    # Step 5: Sort by score and get top_k
-    candidates_sorted = sorted(candidates, key=lambda x: x.get("score", 0), reverse=True)
-    top_candidates = candidates_sorted[:top_k]
+    # Step 5: Record the top_k selection
     metrics["top_k_selected"] = len(top_candidates)
 
-    trace.append({
-        "step": "ranking",
-        "result": f"selected top {len(top_candidates)} candidates"
-    })
+    if trace_enabled:
+        trace.append({
+            "step": "ranking",
+            "result": f"selected top {len(top_candidates)} candidates"
+        })
 
     # Step 6: Investigate if requested
-    step_start = time.time()
+    step_start = time.perf_counter_ns()
     if investigate:
-        for candidate in top_candidates:
-            # Call price history tool
-            price_history = price_history_tool(candidate["id"])
+        # Call both tools for every candidate concurrently, then record results in order
+        tool_results = _investigate_candidates(top_candidates)
+        for candidate, (price_history, availability) in zip(top_candidates, tool_results):
+            # Price history tool
             metrics["tools_called"] += 1
-            trace.append({
-                "step": "tool_call",
-                "tool": "price_history",
-                "input": candidate["id"],
-                "summary": f"last price={price_history['history'][-1]['price']}; trend=stable"
-            })
-
-            # Call availability tool
-            availability = availability_tool(candidate["vendor"])
+            if trace_enabled:
+                trace.append({
+                    "step": "tool_call",
+                    "tool": "price_history",
+                    "input": candidate["id"],
+                    "summary": f"last price={price_history['history'][-1]['price']}; trend=stable"
+                })
+
+            # Availability tool
             metrics["tools_called"] += 1
-            trace.append({
-                "step": "tool_call",
-                "tool": "availability",
-                "input": candidate["vendor"],
-                "summary": f"avg_lead={availability['avg_lead_time_days']} days; in_stock={availability['in_stock']}"
-            })
+            if trace_enabled:
+                trace.append({
+                    "step": "tool_call",
+                    "tool": "availability",
+                    "input": candidate["vendor"],
+                    "summary": f"avg_lead={availability['avg_lead_time_days']} days; in_stock={availability['in_stock']}"
+                })
 
             # Attach tool results to candidate
             candidate["tools"] = {
@@ -300,58 +621,49 @@ def plan_procurement(request: dict, top_k: int = 3, investigate: bool = False, l
                 "availability": availability
             }
 
-        metrics["step_latencies"]["investigation"] = time.time() - step_start
-        trace.append({
-            "step": "investigation",
-            "result": f"called tools for {len(top_candidates)} candidates"
-        })
+        if collect_metrics:
+            metrics["step_latencies"]["investigation"] = _seconds_since(step_start)
+        if trace_enabled:
+            trace.append({
+                "step": "investigation",
+                "result": f"called tools for {len(top_candidates)} candidates"
+            })
 
     # Step 7: Get the selected (top) candidate
     selected = top_candidates[0] if top_candidates else None
 
     if not selected:
-        metrics["total_latency"] = time.time() - start_time
+        metrics["total_latency"] = _seconds_since(start_time)
         return {"error": "no candidates after ranking", "status": 404, "trace": trace, "metrics": metrics}
 
-    # Step 8: Generate justification using LLM
-    step_start = time.time()
-    llm = select_llm_provider(llm_provider, api_key=api_key)
-
-    # Check if LLM provider returned None (API key required)
-    if llm is None:
-        metrics["total_latency"] = time.time() - start_time
-        return {
-            "error": f"API key required for {llm_provider}. Please provide an API key.",
-            "status": 400,
-            "trace": trace,
-            "metrics": metrics
-        }
-
-    # Create prompt for LLM
-    prompt = f"""Selected item details:
-ID: {selected['id']}
-Vendor: {selected['vendor']}
-Price: {selected['price']}
-Lead Time: {selected['lead_time_days']} days
-Reliability: {selected['reliability']}
-
-Request constraints:
-Max Cost: {request.get('max_cost', 'N/A')}
-Latest Delivery: {request.get('latest_delivery_days', 'N/A')} days
-
-Please provide a brief justification (2-3 sentences) for why this item is the best choice.
-"""
+    # Step 8: Generate justification using LLM (skipped when the caller only needs the selection)
+    justification = ""
+    if generate_justification:
+        step_start = time.perf_counter_ns()
+        llm = _get_llm(llm_provider, api_key or os.getenv("OPENAI_API_KEY"))
+
+        # Check if LLM provider returned None (API key required)
+        if llm is None:
+            metrics["total_latency"] = _seconds_since(start_time)
+            return {
+                "error": f"API key required for {llm_provider}. Please provide an API key.",
+                "status": 400,
+                "trace": trace,
+                "metrics": metrics
+            }
 
-    justification = llm.generate(prompt, max_tokens=150)
-    metrics["step_latencies"]["llm_justification"] = time.time() - step_start
+        justification = _justify(selected, request, llm)
+        if collect_metrics:
+            metrics["step_latencies"]["llm_justification"] = _seconds_since(step_start)
 
-    trace.append({
-        "step": "llm_justification",
-        "result": "generated justification"
-    })
+        if trace_enabled:
+            trace.append({
+                "step": "llm_justification",
+                "result": "generated justification"
+            })
 
     # Step 9: Calculate final metrics
-    metrics["total_latency"] = time.time() - start_time
+    metrics["total_latency"] = _seconds_since(start_time)
 
     # Step 10: Build and return result
     return {
@@ -364,6 +676,25 @@ Please provide a brief justification (2-3 sentences) for why this item is the be
     }
 
 
+# Negotiation verdicts and transcript lines, indexed by budget class (see negotiate_procurement)
+_VERDICTS = ("APPROVED", "APPROVED_WITH_CONDITIONS", "ESCALATED")
+
+_PROPOSAL_TEMPLATE = "Agent: I recommend {item_id} from {vendor} at ${price}. It has the best overall score considering price, lead time, and reliability."
+_RESPONSE_TEMPLATES = (
+    (
+        "Officer: Excellent choice. Price of ${price} is well within budget (max: ${max_cost}). This gives us good cost flexibility.",
+    ),
+    (
+        "Officer: The price of ${price} is at the edge of our budget (max: ${max_cost}). Can you verify reliability meets mission-critical needs?",
+        "Agent: Reliability of {reliability} is among the best available for this component. Lead time of {lead_time_days} days also allows buffer.",
+    ),
+    (
+        "Officer: Price of ${price} exceeds budget (max: ${max_cost}). This requires executive approval or we need to reconsider alternatives.",
+    ),
+)
+_DECISION_TEMPLATE = "Officer: Procurement decision for {item_id} is {verdict}."
+
+
 def negotiate_procurement(selected_item: dict, request: dict) -> Dict:
     """
     Simulate a deterministic negotiation between procurement agent and procurement officer.
@@ -375,35 +706,30 @@ def negotiate_procurement(selected_item: dict, request: dict) -> Dict:
     Returns:
         Dict with negotiation transcript and final verdict
     """
-    negotiation_transcript = []
     vendor = selected_item.get("vendor", "Unknown")
     price = selected_item.get("price", 0)
     item_id = selected_item.get("id", "Unknown")
     max_cost = request.get("max_cost", float('inf'))
 
-    # Agent proposes the selection
-    agent_message = f"Agent: I recommend {item_id} from {vendor} at ${price}. It has the best overall score considering price, lead time, and reliability."
-    negotiation_transcript.append(agent_message)
-
-    # Officer's initial response
-    if price <= max_cost * 0.8:
-        officer_response = f"Officer: Excellent choice. Price of ${price} is well within budget (max: ${max_cost}). This gives us good cost flexibility."
-        verdict = "APPROVED"
-        negotiation_transcript.append(officer_response)
-    elif price <= max_cost:
-        officer_response = f"Officer: The price of ${price} is at the edge of our budget (max: ${max_cost}). Can you verify reliability meets mission-critical needs?"
-        agent_justification = f"Agent: Reliability of {selected_item.get('reliability', 0)} is among the best available for this component. Lead time of {selected_item.get('lead_time_days', 0)} days also allows buffer."
-        verdict = "APPROVED_WITH_CONDITIONS"
-        negotiation_transcript.append(officer_response)
-        negotiation_transcript.append(agent_justification)
-    else:
-        officer_response = f"Officer: Price of ${price} exceeds budget (max: ${max_cost}). This requires executive approval or we need to reconsider alternatives."
-        verdict = "ESCALATED"
-        negotiation_transcript.append(officer_response)
+    # Classify the price: 0 = within 80% of budget, 1 = within budget, 2 = over budget
+    verdict_index = (price > max_cost * 0.8) * (1 + (price > max_cost))
+    verdict = _VERDICTS[verdict_index]
+
+    fields = {
+        "item_id": item_id,
+        "vendor": vendor,
+        "price": price,
+        "max_cost": max_cost,
+        "reliability": selected_item.get("reliability", 0),
+        "lead_time_days": selected_item.get("lead_time_days", 0),
+        "verdict": verdict
+    }
 
-    # Final approval statement
-    final_statement = f"Officer: Procurement decision for {item_id} is {verdict}."
-    negotiation_transcript.append(final_statement)
+    # Agent proposal, officer response (plus agent follow-up at the budget edge), final decision
+    negotiation_transcript = [
+        template.format_map(fields)
+        for template in (_PROPOSAL_TEMPLATE, *_RESPONSE_TEMPLATES[verdict_index], _DECISION_TEMPLATE)
+    ]
 
     return {
         "transcript": negotiation_transcript,
@@ -414,6 +740,123 @@ def negotiate_procurement(selected_item: dict, request: dict) -> Dict:
     }
 
 
+# ============================================================================
+# LANGGRAPH WORKFLOW
+# ============================================================================
+
+try:
+    from langgraph.graph import StateGraph
+    from typing_extensions import TypedDict
+    _LANGGRAPH_AVAILABLE = True
+except ImportError:
+    _LANGGRAPH_AVAILABLE = False
+
+
+if _LANGGRAPH_AVAILABLE:
+    class ProcurementState(TypedDict):
+        """Typed state dictionary for LangGraph procurement workflow.
+
+        Contains all state needed to flow through the 4-node procurement graph:
+        catalog search, scoring, tool invocation, and LLM justification.
+        """
+        request: dict
+        llm: object
+        catalog: object
+        survivors: list
+        candidates: list
+        top_candidates: list
+        selected: dict
+        justification: str
+        trace: list
+        metrics: dict
+        price_min: float
+        price_max: float
+        lead_min: float
+        lead_max: float
+        investigate: bool
+        top_k: int
+
+    # Node A: Catalog search
+    def _node_catalog_search(state: ProcurementState) -> ProcurementState:
+        """Search catalog for candidates matching component, spec filters and hard constraints.
+
+        Computes price and lead_time bounds across all candidates for later normalization.
+        """
+        catalog = _load_catalog()
+        indices = catalog.search_indices(state["request"].get("component"), state["request"].get("spec_filters"))
+        survivors, candidates, bounds = _filter_candidates(catalog, indices, state["request"])
+        # Scoring reads rows by index, so it must use this exact catalog even if the file changes
+        state["catalog"] = catalog
+        state["survivors"] = survivors
+        state["candidates"] = candidates
+
+        if candidates:
+            state["price_min"], state["price_max"], state["lead_min"], state["lead_max"] = bounds
+
+        return state
+
+    # Node B: Scoring
+    def _node_scoring(state: ProcurementState) -> ProcurementState:
+        """Score all candidates and select top-k based on weighted scoring.
+
+        Normalizes price and lead_time, applies weights (price, lead_time, reliability).
+        """
+        bounds = (state["price_min"], state["price_max"], state["lead_min"], state["lead_max"])
+        state["top_candidates"] = _score_and_rank(
+            state["catalog"], state["survivors"], state["candidates"], state["request"], bounds, state["top_k"]
+        )
+        state["selected"] = state["top_candidates"][0] if state["top_candidates"] else None
+
+        return state
+
+    # Node C: Conditional tools
+    def _node_tools(state: ProcurementState) -> ProcurementState:
+        """Call tools (price_history, availability) if investigation enabled.
+
+        Attaches tool results to top candidates for extended analysis.
+        """
+        if state["investigate"] and state["top_candidates"]:
+            tool_results = _investigate_candidates(state["top_candidates"])
+            for candidate, (price_history, availability) in zip(state["top_candidates"], tool_results):
+                candidate["tools"] = {
+                    "price_history": price_history,
+                    "availability": availability
+                }
+
+        return state
+
+    # Node D: LLM Justification
+    def _node_llm(state: ProcurementState) -> ProcurementState:
+        """Generate natural language justification for selected candidate using LLM.
+
+        Uses the adapter passed in the state (MockLLM by default).
+        """
+        if state["selected"]:
+            llm_adapter = state["llm"] if state["llm"] else select_llm_provider("mock")
+            state["justification"] = _justify(state["selected"], state["request"], llm_adapter)
+
+        return state
+
+
+@functools.lru_cache(maxsize=None)
+def _compiled_graph():
+    """Build and compile the procurement graph once; it depends only on code, not on the request."""
+    graph = StateGraph(ProcurementState)
+    graph.add_node("catalog_search", _node_catalog_search)
+    graph.add_node("scoring", _node_scoring)
+    graph.add_node("tools", _node_tools)
+    graph.add_node("llm", _node_llm)
+
+    # Add edges
+    graph.add_edge("catalog_search", "scoring")
+    graph.add_edge("scoring", "tools")
+    graph.add_edge("tools", "llm")
+    graph.set_entry_point("catalog_search")
+    graph.set_finish_point("llm")
+
+    return graph.compile()
+
+
 def run_flow(request: dict, investigate: bool = False, llm: LLMAdapter = None, top_k: int = 3) -> dict:
     """
     Run the procurement flow with optional LangGraph integration.
@@ -428,174 +871,45 @@ def run_flow(request: dict, investigate: bool = False, llm: LLMAdapter = None, t
     Returns:
         Result dict matching plan_procurement output
     """
-    # Check if langgraph is available
-    try:
-        from langgraph.graph import StateGraph
-        from typing_extensions import TypedDict
-
-        # Define state schema
-        class ProcurementState(TypedDict):
-            """Typed state dictionary for LangGraph procurement workflow.
-
-            Contains all state needed to flow through the 4-node procurement graph:
-            catalog search, scoring, tool invocation, and LLM justification.
-            """
-            request: dict
-            candidates: list
-            top_candidates: list
-            selected: dict
-            justification: str
-            trace: list
-            metrics: dict
-            price_min: float
-            price_max: float
-            lead_min: float
-            lead_max: float
-            investigate: bool
-            top_k: int
-
-        # Node A: Catalog search
-        def node_catalog_search(state: ProcurementState) -> ProcurementState:
-            """Search catalog for candidates matching component and spec filters.
-
-            Computes price and lead_time bounds across all candidates for later normalization.
-            """
-            catalog = Catalog("catalog.json")
-            component = state["request"].get("component")
-            spec_filters = state["request"].get("spec_filters")
-
-            candidates = catalog.search(component, spec_filters)
-            state["candidates"] = candidates
-
-            if candidates:
-                prices = [item.get("price", 0) for item in candidates]
-                lead_times = [item.get("lead_time_days", 0) for item in candidates]
-                state["price_min"] = min(prices)
-                state["price_max"] = max(prices)
-                state["lead_min"] = min(lead_times)
-                state["lead_max"] = max(lead_times)
-
-            return state
-
-        # Node B: Scoring
-        def node_scoring(state: ProcurementState) -> ProcurementState:
-            """Score all candidates and select top-k based on weighted scoring.
-
-            Normalizes price and lead_time, applies weights (price, lead_time, reliability).
-            """
-            for candidate in state["candidates"]:
-                score = compute_score(
-                    candidate,
-                    state["request"],
-                    state["price_min"],
-                    state["price_max"],
-                    state["lead_min"],
-                    state["lead_max"]
-                )
-                candidate["score"] = score
-
-            candidates_sorted = sorted(state["candidates"], key=lambda x: x.get("score", 0), reverse=True)
-            state["top_candidates"] = candidates_sorted[:state["top_k"]]
-            state["selected"] = state["top_candidates"][0] if state["top_candidates"] else None
-
-            return state
-
-        # Node C: Conditional tools
-        def node_tools(state: ProcurementState) -> ProcurementState:
-            """Call tools (price_history, availability) if investigation enabled.
-
-            Attaches tool results to top candidates for extended analysis.
-            """
-            if state["investigate"] and state["top_candidates"]:
-                for candidate in state["top_candidates"]:
-                    price_history = price_history_tool(candidate["id"])
-                    availability = availability_tool(candidate["vendor"])
-                    candidate["tools"] = {
-                        "price_history": price_history,
-                        "availability": availability
-                    }
-
-            return state
-
-        # Node D: LLM Justification
-        def node_llm(state: ProcurementState) -> ProcurementState:
-            """Generate natural language justification for selected candidate using LLM.
-
-            Uses pluggable LLM adapter (MockLLM by default).
-            """
-            if state["selected"]:
-                llm_adapter = llm if llm else select_llm_provider("mock")
-
-                prompt = f"""Selected item details:
-ID: {state['selected']['id']}
-Vendor: {state['selected']['vendor']}
-Price: {state['selected']['price']}
-Lead Time: {state['selected']['lead_time_days']} days
-Reliability: {state['selected']['reliability']}
-
-Request constraints:
-Max Cost: {state['request'].get('max_cost', 'N/A')}
-Latest Delivery: {state['request'].get('latest_delivery_days', 'N/A')} days
-
-Please provide a brief justification (2-3 sentences) for why this item is the best choice.
-"""
-                state["justification"] = llm_adapter.generate(prompt, max_tokens=150)
-
-            return state
-
-        # Build graph
-        graph = StateGraph(ProcurementState)
-        graph.add_node("catalog_search", node_catalog_search)
-        graph.add_node("scoring", node_scoring)
-        graph.add_node("tools", node_tools)
-        graph.add_node("llm", node_llm)
-
-        # Add edges
-        graph.add_edge("catalog_search", "scoring")
-        graph.add_edge("scoring", "tools")
-        graph.add_edge("tools", "llm")
-        graph.set_entry_point("catalog_search")
-        graph.set_finish_point("llm")
-
-        # Compile and run
-        app = graph.compile()
-
-        initial_state = {
-            "request": request,
-            "candidates": [],
-            "top_candidates": [],
-            "selected": None,
-            "justification": "",
-            "trace": [],
-            "metrics": {
-                "step_latencies": {},
-                "total_candidates": 0,
-                "candidates_after_filtering": 0,
-                "top_k_selected": 0,
-                "tools_called": 0,
-                "total_latency": 0.0
-            },
-            "price_min": 0,
-            "price_max": 0,
-            "lead_min": 0,
-            "lead_max": 0,
-            "investigate": investigate,
-            "top_k": top_k
-        }
-
-        result_state = app.invoke(initial_state)
-
-        # Convert to plan_procurement output format
-        return {
-            "request": result_state["request"],
-            "candidates": result_state["top_candidates"],
-            "selected": result_state["selected"],
-            "justification": result_state["justification"],
-            "trace": result_state["trace"],
-            "metrics": result_state["metrics"]
-        }
-
-    except ImportError:
+    if not _LANGGRAPH_AVAILABLE:
         # LangGraph not available, fall back to synchronous implementation
         llm_provider = "mock" if llm is None else "mock"
         return plan_procurement(request, top_k=top_k, investigate=investigate, llm_provider=llm_provider)
+
+    initial_state = {
+        "request": request,
+        "llm": llm,
+        "catalog": None,
+        "survivors": [],
+        "candidates": [],
+        "top_candidates": [],
+        "selected": None,
+        "justification": "",
+        "trace": [],
+        "metrics": {
+            "step_latencies": {},
+            "total_candidates": 0,
+            "candidates_after_filtering": 0,
+            "top_k_selected": 0,
+            "tools_called": 0,
+            "total_latency": 0.0
+        },
+        "price_min": 0,
+        "price_max": 0,
+        "lead_min": 0,
+        "lead_max": 0,
+        "investigate": investigate,
+        "top_k": top_k
+    }
+
+    result_state = _compiled_graph().invoke(initial_state)
+
+    # Convert to plan_procurement output format
+    return {
+        "request": result_state["request"],
+        "candidates": result_state["top_candidates"],
+        "selected": result_state["selected"],
+        "justification": result_state["justification"],
+        "trace": result_state["trace"],
+        "metrics": result_state["metrics"]
+    }
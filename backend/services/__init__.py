@@ -4,13 +4,20 @@ Services module - Service abstraction layers for backend operations.
 Exports:
   - CatalogService: Unified interface for catalog operations
   - LLMService: Factory for LLM provider initialization
+  - CachedLLMProvider: Serves repeated prompts from a PromptResponseCache
+  - PromptResponseCache: Exact-prompt LRU cache for LLM responses
+  - SemanticResponseCache: Embedding-keyed cache for LLM responses
 """
 
 from backend.services.catalog_service import CatalogService
-from backend.services.llm_service import LLMService, LLMProvider
+from backend.services.llm_service import LLMService, LLMProvider, CachedLLMProvider
+from backend.services.response_cache import PromptResponseCache, SemanticResponseCache
 
 __all__ = [
     "CatalogService",
     "LLMService",
-    "LLMProvider"
+    "LLMProvider",
+    "CachedLLMProvider",
+    "PromptResponseCache",
+    "SemanticResponseCache"
 ]
@@ -1,64 +1,318 @@
 """
 LLM Service - Abstraction layer for LLM providers.
 
-Provides unified interface for interacting with different LLM providers.
+Provides unified interface for interacting with different LLM providers, plus a
+wrapper that serves repeated prompts from a response cache. Providers can stream
+responses chunk by chunk for callers that forward text as it arrives.
 """
 
 from abc import ABC, abstractmethod
-from typing import Optional
+from typing import Any, AsyncIterator, Callable, Iterator, List, Optional, Tuple
+import asyncio
+import functools
+import inspect
 import os
 
+from backend.services.response_cache import PromptResponseCache
+
+
+# Short completions (<=200 tokens) normally return in a few seconds; a request still
+# pending after this long is more likely to finish sooner if retried than if awaited
+DEFAULT_REQUEST_TIMEOUT = 8.0
+DEFAULT_MAX_RETRIES = 2
+
+
+@functools.lru_cache(maxsize=None)
+def _accepts_system(func: Callable) -> bool:
+    """Whether a provider method takes the system argument (or arbitrary keyword arguments)."""
+    parameters = inspect.signature(func).parameters.values()
+    return any(p.name == "system" or p.kind is inspect.Parameter.VAR_KEYWORD for p in parameters)
+
+
+def call_with_system(method: Callable, prompt: str, max_tokens: int, system: Optional[str]) -> Any:
+    """Call a provider's generate/agenerate/stream/astream, passing system only when it is set.
+
+    Providers registered before system prompts existed define generate(prompt, max_tokens);
+    for those the system instructions are prepended to the prompt instead.
+
+    Args:
+        method: Bound provider method to call
+        prompt: The prompt to send to the LLM
+        max_tokens: Maximum tokens in the response
+        system: Optional system instructions
+
+    Returns:
+        Whatever the method returns (text, coroutine or iterator)
+    """
+    if system is None:
+        return method(prompt, max_tokens=max_tokens)
+    if _accepts_system(getattr(method, "__func__", method)):
+        return method(prompt, max_tokens=max_tokens, system=system)
+    return method(f"{system}\n\n{prompt}", max_tokens=max_tokens)
+
 
 class LLMProvider(ABC):
     """Abstract base class for LLM providers."""
 
     @abstractmethod
-    def generate(self, prompt: str, max_tokens: int = 200) -> str:
+    def generate(self, prompt: str, max_tokens: int = 200, system: Optional[str] = None) -> str:
         """Generate text using the LLM.
 
         Args:
             prompt: The prompt to send to the LLM
             max_tokens: Maximum tokens in the response
+            system: Optional system instructions, sent ahead of the prompt
 
         Returns:
             Generated text
         """
         pass
 
+    def cache_namespace(self) -> Tuple:
+        """Identify the settings that determine this provider's output, for response caching.
+
+        Providers with a configurable model or sampling parameters should include them, so
+        differently configured providers sharing one cache never serve each other's responses.
+
+        Returns:
+            Hashable tuple, starting with the provider class name
+        """
+        return (type(self).__name__,)
+
+    async def agenerate(self, prompt: str, max_tokens: int = 200, system: Optional[str] = None) -> str:
+        """Generate text without blocking the event loop.
+
+        The default runs generate on a worker thread; providers with an async client
+        should override this.
+
+        Args:
+            prompt: The prompt to send to the LLM
+            max_tokens: Maximum tokens in the response
+            system: Optional system instructions, sent ahead of the prompt
+
+        Returns:
+            Generated text
+        """
+        return await asyncio.to_thread(call_with_system, self.generate, prompt, max_tokens, system)
+
+    def stream(self, prompt: str, max_tokens: int = 200, system: Optional[str] = None) -> Iterator[str]:
+        """Generate text as a sequence of chunks.
+
+        The default yields the complete response as a single chunk; providers with a
+        streaming API should override this to yield text as soon as it is produced.
+
+        Args:
+            prompt: The prompt to send to the LLM
+            max_tokens: Maximum tokens in the response
+            system: Optional system instructions, sent ahead of the prompt
+
+        Yields:
+            Successive pieces of the generated text
+        """
+        yield call_with_system(self.generate, prompt, max_tokens, system)
+
+    async def astream(self, prompt: str, max_tokens: int = 200, system: Optional[str] = None) -> AsyncIterator[str]:
+        """Async variant of stream.
+
+        The default yields the complete agenerate response as a single chunk; providers
+        with an async streaming API should override this.
+
+        Args:
+            prompt: The prompt to send to the LLM
+            max_tokens: Maximum tokens in the response
+            system: Optional system instructions, sent ahead of the prompt
+
+        Yields:
+            Successive pieces of the generated text
+        """
+        yield await call_with_system(self.agenerate, prompt, max_tokens, system)
+
+
+class CachedLLMProvider(LLMProvider):
+    """Serves byte-identical prompts from a PromptResponseCache instead of the provider.
+
+    The cache namespace is the wrapped provider's cache_namespace() (class name, model and
+    sampling settings), so one cache can be shared by differently configured providers
+    without mixing their responses.
+    """
+
+    def __init__(self, provider: LLMProvider, cache: PromptResponseCache):
+        """Initialize the caching wrapper.
+
+        Args:
+            provider: Provider used on a cache miss
+            cache: Response cache, typically shared across sessions
+        """
+        self.provider = provider
+        self.cache = cache
+        self._namespace = provider.cache_namespace()
+
+    def generate(self, prompt: str, max_tokens: int = 200, system: Optional[str] = None) -> str:
+        """Return the cached response for prompt, generating it on a miss."""
+        key = self.cache.make_key(self._namespace, prompt, max_tokens, system)
+        response = self.cache.get(key)
+        if response is None:
+            response = call_with_system(self.provider.generate, prompt, max_tokens, system)
+            self.cache.put(key, response)
+        return response
+
+    async def agenerate(self, prompt: str, max_tokens: int = 200, system: Optional[str] = None) -> str:
+        """Async variant of generate."""
+        key = self.cache.make_key(self._namespace, prompt, max_tokens, system)
+        response = self.cache.get(key)
+        if response is None:
+            response = await call_with_system(self.provider.agenerate, prompt, max_tokens, system)
+            self.cache.put(key, response)
+        return response
+
+    def stream(self, prompt: str, max_tokens: int = 200, system: Optional[str] = None) -> Iterator[str]:
+        """Stream from the provider, or yield a cached response as one chunk."""
+        key = self.cache.make_key(self._namespace, prompt, max_tokens, system)
+        response = self.cache.get(key)
+        if response is not None:
+            yield response
+            return
+        chunks = []
+        for chunk in call_with_system(self.provider.stream, prompt, max_tokens, system):
+            chunks.append(chunk)
+            yield chunk
+        self.cache.put(key, "".join(chunks))
+
+    async def astream(self, prompt: str, max_tokens: int = 200, system: Optional[str] = None) -> AsyncIterator[str]:
+        """Async variant of stream."""
+        key = self.cache.make_key(self._namespace, prompt, max_tokens, system)
+        response = self.cache.get(key)
+        if response is not None:
+            yield response
+            return
+        chunks = []
+        async for chunk in call_with_system(self.provider.astream, prompt, max_tokens, system):
+            chunks.append(chunk)
+            yield chunk
+        self.cache.put(key, "".join(chunks))
+
 
 class OpenAIProvider(LLMProvider):
     """OpenAI LLM provider implementation."""
 
-    def __init__(self, api_key: Optional[str] = None):
+    def __init__(self, api_key: Optional[str] = None, request_timeout: float = DEFAULT_REQUEST_TIMEOUT,
+                 max_retries: int = DEFAULT_MAX_RETRIES, model: str = "gpt-3.5-turbo", temperature: float = 0.7):
         """Initialize OpenAI provider.
 
         Args:
             api_key: OpenAI API key (uses env var if not provided)
+            request_timeout: Seconds to wait for a response before the request is retried
+            max_retries: Retries (with jittered exponential backoff) after a timeout or
+                transient error
+            model: Chat model to use
+            temperature: Sampling temperature
         """
         self.api_key = api_key or os.getenv("OPENAI_API_KEY")
         if not self.api_key:
             raise ValueError("OpenAI API key required")
+        self.request_timeout = request_timeout
+        self.max_retries = max_retries
+        self.model = model
+        self.temperature = temperature
+        self._client = None
+        self._async_client = None
+        self._async_client_loop = None
+
+    def _get_client(self):
+        """Return the sync OpenAI client, created on first use and reused so its connection pool survives."""
+        if self._client is None:
+            from openai import OpenAI
+            self._client = OpenAI(api_key=self.api_key, timeout=self.request_timeout, max_retries=self.max_retries)
+        return self._client
+
+    def _get_async_client(self):
+        """Return the async OpenAI client for the running event loop, created once per loop.
+
+        Its pooled connections belong to the loop that opened them, so a caller on a new
+        loop (e.g. a fresh asyncio.run) gets a new client.
+        """
+        loop = asyncio.get_running_loop()
+        if self._async_client is None or self._async_client_loop is not loop:
+            from openai import AsyncOpenAI
+            self._async_client = AsyncOpenAI(api_key=self.api_key, timeout=self.request_timeout,
+                                             max_retries=self.max_retries)
+            self._async_client_loop = loop
+        return self._async_client
+
+    def cache_namespace(self) -> Tuple:
+        """Identify this provider's output settings: class name, model and temperature."""
+        return (type(self).__name__, self.model, self.temperature)
 
-    def generate(self, prompt: str, max_tokens: int = 200) -> str:
+    @staticmethod
+    def _messages(prompt: str, system: Optional[str]) -> List[dict]:
+        """Build the chat messages, with system instructions first so they form a stable prefix."""
+        messages = [{"role": "system", "content": system}] if system else []
+        messages.append({"role": "user", "content": prompt})
+        return messages
+
+    def generate(self, prompt: str, max_tokens: int = 200, system: Optional[str] = None) -> str:
         """Generate text using OpenAI API."""
         try:
-            from openai import OpenAI
-            client = OpenAI(api_key=self.api_key)
-            response = client.chat.completions.create(
-                model="gpt-3.5-turbo",
-                messages=[{"role": "user", "content": prompt}],
+            response = self._get_client().chat.completions.create(
+                model=self.model,
+                messages=self._messages(prompt, system),
                 max_tokens=max_tokens,
-                temperature=0.7
+                temperature=self.temperature
             )
             return response.choices[0].message.content
         except Exception as e:
             raise RuntimeError(f"OpenAI API error: {str(e)}")
 
+    async def agenerate(self, prompt: str, max_tokens: int = 200, system: Optional[str] = None) -> str:
+        """Generate text using the async OpenAI client."""
+        try:
+            response = await self._get_async_client().chat.completions.create(
+                model=self.model,
+                messages=self._messages(prompt, system),
+                max_tokens=max_tokens,
+                temperature=self.temperature
+            )
+            return response.choices[0].message.content
+        except Exception as e:
+            raise RuntimeError(f"OpenAI API error: {str(e)}")
+
+    def stream(self, prompt: str, max_tokens: int = 200, system: Optional[str] = None) -> Iterator[str]:
+        """Stream text from the OpenAI API as content deltas arrive."""
+        try:
+            response = self._get_client().chat.completions.create(
+                model=self.model,
+                messages=self._messages(prompt, system),
+                max_tokens=max_tokens,
+                temperature=self.temperature,
+                stream=True
+            )
+            for chunk in response:
+                if chunk.choices and chunk.choices[0].delta.content:
+                    yield chunk.choices[0].delta.content
+        except Exception as e:
+            raise RuntimeError(f"OpenAI API error: {str(e)}")
+
+    async def astream(self, prompt: str, max_tokens: int = 200, system: Optional[str] = None) -> AsyncIterator[str]:
+        """Stream text from the async OpenAI client as content deltas arrive."""
+        try:
+            response = await self._get_async_client().chat.completions.create(
+                model=self.model,
+                messages=self._messages(prompt, system),
+                max_tokens=max_tokens,
+                temperature=self.temperature,
+                stream=True
+            )
+            async for chunk in response:
+                if chunk.choices and chunk.choices[0].delta.content:
+                    yield chunk.choices[0].delta.content
+        except Exception as e:
+            raise RuntimeError(f"OpenAI API error: {str(e)}")
+
 
 class MockLLMProvider(LLMProvider):
     """Mock LLM provider for testing (fallback only)."""
 
-    def generate(self, prompt: str, max_tokens: int = 200) -> str:
+    def generate(self, prompt: str, max_tokens: int = 200, system: Optional[str] = None) -> str:
         """Generate mock response."""
         return "Mock response: Based on the analysis, I recommend considering cost-benefit tradeoffs and vendor flexibility when making procurement decisions."
 
@@ -72,12 +326,13 @@ class LLMService:
     }
 
     @staticmethod
-    def get_provider(provider_name: str, api_key: Optional[str] = None) -> Optional[LLMProvider]:
+    def get_provider(provider_name: str, api_key: Optional[str] = None, **options) -> Optional[LLMProvider]:
         """Get LLM provider instance.
 
         Args:
             provider_name: Name of the provider
             api_key: API key for the provider
+            **options: Provider settings such as request_timeout and max_retries
 
         Returns:
             LLM provider instance or None
@@ -88,7 +343,7 @@ class LLMService:
 
         try:
             if provider_name.lower() == "openai":
-                return provider_class(api_key)
+                return provider_class(api_key, **options)
             else:
                 return provider_class()
         except Exception:
@@ -98,6 +353,9 @@ class LLMService:
     def register_provider(name: str, provider_class):
         """Register a new LLM provider.
 
+        Providers whose methods lack the system parameter still work: agents pass system
+        instructions through call_with_system, which prepends them to the prompt.
+
         Args:
             name: Provider name
             provider_class: Provider class inheriting from LLMProvider
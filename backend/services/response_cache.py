@@ -0,0 +1,182 @@
+"""
+Response Cache - Caches for LLM completions.
+
+PromptResponseCache returns a stored completion for a byte-identical prompt;
+SemanticResponseCache returns one when a new message is a near-duplicate of one seen
+before, so repeated buyer questions skip the LLM round-trip.
+"""
+
+import hashlib
+import re
+import threading
+from collections import OrderedDict
+from typing import Callable, Dict, Hashable, List, Optional, Tuple
+import numpy as np
+
+
+_RE_NUMBER = re.compile(r'\d+(?:\.\d+)?')
+
+
+class PromptResponseCache:
+    """Thread-safe LRU cache of LLM responses keyed on the exact prompt.
+
+    Prompts are stored as a 16-byte BLAKE2b digest, so long prompts cost no more memory
+    than short ones. One instance can be shared by every provider in the process.
+    """
+
+    def __init__(self, max_entries: int = 4096):
+        """Initialize the cache.
+
+        Args:
+            max_entries: Responses kept (least recently used evicted first)
+        """
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Tuple, str]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def make_key(namespace: Hashable, prompt: str, max_tokens: int, system: Optional[str] = None) -> Tuple:
+        """Build the cache key for a prompt (and system instructions) sent to a given provider.
+
+        Args:
+            namespace: Provider identity, e.g. LLMProvider.cache_namespace()
+            prompt: The user prompt
+            max_tokens: Maximum tokens in the response
+            system: Optional system instructions
+
+        Returns:
+            Hashable cache key
+        """
+        system_digest = hashlib.blake2b(system.encode(), digest_size=16).digest() if system else None
+        return (namespace, max_tokens, system_digest, hashlib.blake2b(prompt.encode(), digest_size=16).digest())
+
+    def get(self, key: Tuple) -> Optional[str]:
+        """Return the cached response for key, or None on a miss."""
+        with self._lock:
+            response = self._entries.get(key)
+            if response is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return response
+
+    def put(self, key: Tuple, response: str) -> None:
+        """Store a response, evicting the least recently used entry when full."""
+        with self._lock:
+            self._entries[key] = response
+            self._entries.move_to_end(key)
+            if len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def stats(self) -> Dict[str, int]:
+        """Return hit/miss counters."""
+        return {"hits": self.hits, "misses": self.misses, "entries": len(self._entries)}
+
+
+class SemanticResponseCache:
+    """Embedding-keyed cache of LLM responses, partitioned by namespace.
+
+    Messages are compared with numbers masked out so that differently worded questions
+    match, while the numbers themselves become part of the namespace so a cached answer
+    about 50 units is never returned for a question about 10 units.
+
+    Thread-safe: one instance can be shared by every session. The embedding call and the
+    generate callback run outside the lock, so a slow LLM call never blocks other lookups.
+    """
+
+    def __init__(
+        self,
+        embed_fn: Callable[[str], Optional[List[float]]],
+        threshold: float = 0.92,
+        max_entries_per_namespace: int = 256,
+        max_namespaces: int = 1024
+    ):
+        """Initialize the cache.
+
+        Args:
+            embed_fn: Function returning an embedding vector for text (or None if unavailable)
+            threshold: Minimum cosine similarity for a cache hit
+            max_entries_per_namespace: Entries kept per namespace (oldest evicted first)
+            max_namespaces: Namespaces kept (least recently used evicted first)
+        """
+        self.embed_fn = embed_fn
+        self.threshold = threshold
+        self.max_entries_per_namespace = max_entries_per_namespace
+        self.max_namespaces = max_namespaces
+        self._namespaces: "OrderedDict[Tuple, Tuple[List[np.ndarray], List[str]]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def _split_message(message: str) -> Tuple[str, Tuple[str, ...]]:
+        """Return the number-masked, normalized message and the numbers it contains."""
+        text = " ".join(message.lower().split())
+        return _RE_NUMBER.sub("#", text), tuple(_RE_NUMBER.findall(text))
+
+    def _embed(self, text: str) -> Optional[np.ndarray]:
+        """Embed text and L2-normalize it so similarity is a dot product."""
+        embedding = self.embed_fn(text)
+        if not embedding:
+            return None
+        vector = np.asarray(embedding, dtype=np.float32)
+        norm = np.linalg.norm(vector)
+        if norm == 0:
+            return None
+        return vector / norm
+
+    def get_or_generate(self, namespace: Tuple, message: str, generate: Callable[[], str]) -> str:
+        """Return a cached response for a near-duplicate message, generating it on a miss.
+
+        Args:
+            namespace: Partition key (e.g. the item ID) so unrelated contexts never collide
+            message: The incoming user message
+            generate: Zero-argument callable producing the response on a cache miss
+
+        Returns:
+            Cached or freshly generated response string
+        """
+        template, numbers = self._split_message(message)
+        key = (namespace, numbers)
+        vector = self._embed(template)
+        if vector is None:
+            # Embeddings unavailable - behave as a pass-through
+            with self._lock:
+                self.misses += 1
+            return generate()
+
+        with self._lock:
+            entry = self._namespaces.get(key)
+            if entry is not None:
+                vectors, responses = entry
+                similarities = np.stack(vectors) @ vector
+                best = int(np.argmax(similarities))
+                if similarities[best] >= self.threshold:
+                    self._namespaces.move_to_end(key)
+                    self.hits += 1
+                    return responses[best]
+            self.misses += 1
+
+        response = generate()
+
+        with self._lock:
+            # The namespace may have been evicted while generating; setdefault recreates it
+            vectors, responses = self._namespaces.setdefault(key, ([], []))
+            vectors.append(vector)
+            responses.append(response)
+            if len(vectors) > self.max_entries_per_namespace:
+                del vectors[0], responses[0]
+
+            self._namespaces.move_to_end(key)
+            if len(self._namespaces) > self.max_namespaces:
+                self._namespaces.popitem(last=False)
+
+        return response
+
+    def stats(self) -> Dict[str, int]:
+        """Return hit/miss counters."""
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "namespaces": len(self._namespaces)}
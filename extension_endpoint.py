@@ -5,6 +5,7 @@ This module provides a deterministic mock endpoint that accepts vendor constrain
 and returns updated candidate lists without requiring network access.
 """
 
+from collections import OrderedDict
 from typing import Dict, List, Optional
 
 
@@ -63,10 +64,17 @@ class MockVendorEndpoint:
     Simulates an external service without requiring network access.
     """
 
-    def __init__(self):
-        """Initialize the mock endpoint."""
+    def __init__(self, max_entries: int = 10_000):
+        """Initialize the mock endpoint.
+
+        Args:
+            max_entries: Requests kept in the history (oldest dropped first) and in the
+                constraint cache (least recently used evicted first)
+        """
+        self.max_entries = max_entries
         self.request_history = []
-        self.constraint_cache = {}
+        self.constraint_cache: "OrderedDict[str, Dict]" = OrderedDict()
+        self._request_count = 0
 
     def post_vendor_constraints(self, request_id: str, candidates: List[Dict], constraints: Dict) -> Dict:
         """
@@ -84,14 +92,20 @@ class MockVendorEndpoint:
         self.request_history.append({
             "request_id": request_id,
             "constraints": constraints,
-            "timestamp": len(self.request_history)  # Deterministic "timestamp"
+            "timestamp": self._request_count  # Deterministic "timestamp"
         })
+        self._request_count += 1
+        if len(self.request_history) > self.max_entries:
+            del self.request_history[:-self.max_entries]
 
         # Apply constraints
         filtered_candidates = apply_vendor_constraints(candidates, constraints)
 
-        # Cache the constraints
+        # Cache the constraints (LRU-bounded so memory stays flat under bulk updates)
         self.constraint_cache[request_id] = constraints
+        self.constraint_cache.move_to_end(request_id)
+        if len(self.constraint_cache) > self.max_entries:
+            self.constraint_cache.popitem(last=False)
 
         return {
             "status": "success",
@@ -112,7 +126,10 @@ class MockVendorEndpoint:
         Returns:
             Constraint dict if found, None otherwise
         """
-        return self.constraint_cache.get(request_id)
+        constraints = self.constraint_cache.get(request_id)
+        if constraints is not None:
+            self.constraint_cache.move_to_end(request_id)
+        return constraints
 
     def bulk_update_constraints(self, requests: List[Dict]) -> Dict:
         """
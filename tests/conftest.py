@@ -0,0 +1,10 @@
+"""Shared pytest fixtures."""
+
+import pytest
+from backend.core.catalog import Catalog
+
+
+@pytest.fixture(scope="session")
+def catalog():
+    """Catalog loaded once per test session (tests only read from it)."""
+    return Catalog("catalog.json")
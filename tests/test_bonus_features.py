@@ -7,7 +7,6 @@ Tests for bonus features:
 """
 
 import pytest
-from backend.core.catalog import Catalog
 from backend.core.procurement import plan_procurement, negotiate_procurement, price_history_tool, availability_tool
 from extension_endpoint import MockVendorEndpoint, apply_vendor_constraints, get_endpoint
 
@@ -15,9 +14,8 @@ from extension_endpoint import MockVendorEndpoint, apply_vendor_constraints, get
 class TestSemanticSearch:
     """Test semantic search functionality in Catalog."""
 
-    def test_search_semantic_basic(self):
+    def test_search_semantic_basic(self, catalog):
         """Test basic semantic search."""
-        catalog = Catalog("catalog.json")
         results = catalog.search_semantic("solar power", top_k=3)
 
         assert len(results) > 0
@@ -26,9 +24,8 @@ class TestSemanticSearch:
             assert "id" in item
             assert "component" in item
 
-    def test_search_semantic_deterministic(self):
+    def test_search_semantic_deterministic(self, catalog):
         """Test that semantic search is deterministic."""
-        catalog = Catalog("catalog.json")
         results1 = catalog.search_semantic("battery capacity", top_k=2)
         results2 = catalog.search_semantic("battery capacity", top_k=2)
 
@@ -37,9 +34,8 @@ class TestSemanticSearch:
         for r1, r2 in zip(results1, results2):
             assert r1["id"] == r2["id"]
 
-    def test_search_semantic_returns_items(self):
+    def test_search_semantic_returns_items(self, catalog):
         """Test that semantic search returns valid items."""
-        catalog = Catalog("catalog.json")
         results = catalog.search_semantic("thruster engine", top_k=5)
 
         assert len(results) <= 5
@@ -182,6 +178,21 @@ class TestMockVendorEndpoint:
         assert len(result) == 1
         assert result[0]["id"] == "SP-200"
 
+    def test_apply_vendor_constraints_missing_fields(self):
+        """Test that missing fields use their defaults and non-string vendors are compared safely."""
+        candidates = [
+            {"id": "SP-100", "vendor": "Helios Dynamics", "reliability": 0.985},
+            {"id": "SP-200", "vendor": None, "reliability": 0.99, "lead_time_days": 14},
+            {"id": "SP-300", "vendor": 42, "lead_time_days": 10},
+            {"id": "SP-400", "reliability": 0.97, "lead_time_days": 30},
+        ]
+
+        constraints = {"excluded_vendors": ["Astra Components", None], "min_reliability": 0.9, "max_lead_time": 20}
+        result = apply_vendor_constraints(candidates, constraints)
+
+        # SP-100 has no lead time (treated as 0); SP-300 has no reliability (treated as 0)
+        assert [c["id"] for c in result] == ["SP-100"]
+
     def test_mock_vendor_endpoint_post(self):
         """Test MockVendorEndpoint POST handler."""
         endpoint = MockVendorEndpoint()
@@ -215,6 +226,22 @@ class TestMockVendorEndpoint:
         assert retrieved == constraints
         assert endpoint.get_constraint_history("non-existent") is None
 
+    def test_mock_vendor_endpoint_bounded_history(self):
+        """Test that history keeps the newest requests and the constraint cache evicts the least recently read."""
+        endpoint = MockVendorEndpoint(max_entries=2)
+
+        endpoint.post_vendor_constraints("req-1", [], {"min_reliability": 0.9})
+        endpoint.post_vendor_constraints("req-2", [], {"min_reliability": 0.95})
+        endpoint.get_constraint_history("req-1")  # req-1 is now most recently used
+        endpoint.post_vendor_constraints("req-3", [], {"min_reliability": 0.99})
+
+        # History is a plain list of the newest requests, timestamps keep counting
+        assert [entry["request_id"] for entry in endpoint.request_history[-5:]] == ["req-2", "req-3"]
+        assert endpoint.request_history[-1]["timestamp"] == 2
+
+        assert endpoint.get_constraint_history("req-1") == {"min_reliability": 0.9}
+        assert endpoint.get_constraint_history("req-2") is None
+
     def test_mock_vendor_endpoint_bulk_update(self):
         """Test MockVendorEndpoint bulk update handler."""
         endpoint = MockVendorEndpoint()
@@ -4,9 +4,10 @@ from backend.core.catalog import Catalog  # Assuming catalog.py is the file wher
 
 class TestCatalog(unittest.TestCase):
 
-    def setUp(self):
+    @classmethod
+    def setUpClass(cls):
         catalog_path = 'catalog.json'
-        self.catalog = Catalog(catalog_path)
+        cls.catalog = Catalog(catalog_path)
 
     def test_search(self):
         # Test without filters
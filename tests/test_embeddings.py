@@ -0,0 +1,139 @@
+"""
+Tests for the embedding cache and index in backend/core/embeddings.py.
+"""
+
+import shutil
+import zlib
+from pathlib import Path
+import numpy as np
+import pytest
+from backend.core import embeddings
+from backend.core.catalog import Catalog
+from backend.core.embeddings import EmbeddingManager
+
+
+CATALOG_PATH = Path(__file__).parent.parent / "catalog.json"
+
+
+@pytest.fixture
+def fake_embeddings(monkeypatch):
+    """Replace the OpenAI embedding call with a deterministic one; returns the list of embedded texts."""
+    texts = []
+
+    def fake_get_embedding(self, text, use_cache=True, persist=True):
+        texts.append(text)
+        seed = zlib.crc32(text.encode())
+        return [((seed >> shift) & 0xFF) / 255.0 + 0.01 for shift in (0, 8, 16, 24)]
+
+    monkeypatch.setattr(EmbeddingManager, "_get_embedding", fake_get_embedding)
+    return texts
+
+
+class TestCatalogMatrixCache:
+    """Test the per-catalog .npy embedding matrix cache."""
+
+    def test_round_trip(self, tmp_path):
+        """Test that a saved matrix loads back for the same catalog bytes only."""
+        manager = EmbeddingManager(cache_dir=str(tmp_path))
+        matrix = np.arange(12, dtype=np.float64).reshape(3, 4)
+
+        manager.save_catalog_matrix(b"catalog-a", matrix)
+
+        assert np.array_equal(manager.load_catalog_matrix(b"catalog-a"), matrix)
+        assert manager.load_catalog_matrix(b"catalog-b") is None
+
+    def test_key_depends_on_catalog_bytes_and_model(self, tmp_path, monkeypatch):
+        """Test that editing the catalog or switching embedding model changes the cache file."""
+        manager = EmbeddingManager(cache_dir=str(tmp_path))
+        original = manager._matrix_path(b"catalog-a")
+
+        assert manager._matrix_path(b"catalog-a") == original
+        assert manager._matrix_path(b"catalog-a ") != original
+
+        monkeypatch.setattr(embeddings, "EMBEDDING_MODEL", "text-embedding-3-large")
+        assert manager._matrix_path(b"catalog-a") != original
+
+    @pytest.mark.parametrize("contents", [b"", b"not an npy file", "truncated"], ids=["empty", "garbage", "truncated"])
+    def test_corrupt_file_is_a_miss(self, tmp_path, contents):
+        """Test that an unreadable matrix file loads as None instead of raising."""
+        manager = EmbeddingManager(cache_dir=str(tmp_path))
+        manager.save_catalog_matrix(b"catalog-a", np.ones((5, 4)))
+        path = manager._matrix_path(b"catalog-a")
+        if contents == "truncated":
+            contents = path.read_bytes()[:-40]
+        path.write_bytes(contents)
+
+        assert manager.load_catalog_matrix(b"catalog-a") is None
+
+    def test_corrupt_file_triggers_rebuild(self, tmp_path, monkeypatch, fake_embeddings):
+        """Test that Catalog re-embeds and rewrites the matrix when the cached file is corrupt."""
+        shutil.copy(CATALOG_PATH, tmp_path / "catalog.json")
+        monkeypatch.chdir(tmp_path)
+
+        first = Catalog("catalog.json")
+        item_count = len(first.items)
+        assert len(fake_embeddings) == item_count
+        (matrix_file,) = (tmp_path / ".embeddings_cache").glob("catalog_*.npy")
+
+        # A clean cache is reused without embedding anything
+        Catalog("catalog.json")
+        assert len(fake_embeddings) == item_count
+
+        matrix_file.write_bytes(b"corrupt")
+        rebuilt = Catalog("catalog.json")
+
+        assert len(fake_embeddings) == 2 * item_count
+        assert [item["embedding"] for item in rebuilt.items] == [item["embedding"] for item in first.items]
+        assert np.load(matrix_file).shape == (item_count, 4)
+
+
+class TestEmbeddingIndex:
+    """Test EmbeddingIndex ranking with the NumPy backend."""
+
+    @pytest.fixture(autouse=True)
+    def numpy_backend(self, monkeypatch):
+        """Force the NumPy inner-product path even when faiss is installed."""
+        monkeypatch.setattr(embeddings, "faiss", None)
+
+    MATRIX = [
+        [1.0, 0.0],    # row 0: similarity 1.0 to [1, 0]
+        [0.0, 3.0],    # row 1: orthogonal
+        [2.0, 2.0],    # row 2: ~0.707
+        [-1.0, 0.0],   # row 3: opposite
+        [10.0, 1.0],   # row 4: ~0.995 (magnitude must not matter)
+    ]
+
+    def test_top_k_is_ordered_by_cosine_similarity(self):
+        """Test that results are the top_k rows, most similar first, with cosine scores."""
+        index = embeddings.EmbeddingIndex(self.MATRIX)
+
+        results = index.search([5.0, 0.0], top_k=3)
+
+        assert [row for row, _ in results] == [0, 4, 2]
+        scores = [score for _, score in results]
+        assert scores == sorted(scores, reverse=True)
+        assert scores == pytest.approx([1.0, 10 / np.sqrt(101), np.sqrt(0.5)], abs=1e-6)
+
+    def test_threshold_and_top_k_larger_than_index(self):
+        """Test that the threshold drops weak matches and top_k may exceed the row count."""
+        index = embeddings.EmbeddingIndex(self.MATRIX)
+
+        results = index.search([1.0, 0.0], top_k=10, threshold=0.5)
+
+        assert [row for row, _ in results] == [0, 4, 2]
+        assert len(index.search([1.0, 0.0], top_k=10)) == 4  # row 3 (-1.0) is below the 0.0 default
+
+    def test_ties_keep_row_order(self):
+        """Test that equally similar rows are returned in row order."""
+        index = embeddings.EmbeddingIndex([[0.0, 1.0], [1.0, 0.0], [2.0, 0.0], [3.0, 0.0]])
+
+        assert [row for row, _ in index.search([1.0, 0.0], top_k=2)] == [1, 2]
+
+    def test_degenerate_queries(self):
+        """Test that a zero query, top_k <= 0 and an all-zero row are handled without errors."""
+        index = embeddings.EmbeddingIndex(self.MATRIX + [[0.0, 0.0]])
+
+        assert index.search([0.0, 0.0], top_k=3) == []
+        assert index.search([1.0, 0.0], top_k=0) == []
+        assert dict(index.search([1.0, 0.0], top_k=10))[5] == 0.0  # zero row scores like an orthogonal one
+        assert len(index) == 6
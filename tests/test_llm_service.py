@@ -0,0 +1,234 @@
+"""
+Tests for the LLM providers in backend/services/llm_service.py.
+"""
+
+import asyncio
+import sys
+import types
+import pytest
+from backend.agents.negotiation_agent import NegotiationAgent
+from backend.services.llm_service import CachedLLMProvider, LLMProvider, LLMService, OpenAIProvider
+from backend.services.response_cache import PromptResponseCache
+
+
+def _completion(text):
+    """Build an object shaped like a chat completion response."""
+    message = types.SimpleNamespace(content=text)
+    return types.SimpleNamespace(choices=[types.SimpleNamespace(message=message)])
+
+
+def _stream_chunks(text):
+    """Build chat completion stream chunks: one per word, then an empty final delta."""
+    words = [word + " " for word in text.split()] + [None]
+    return [types.SimpleNamespace(choices=[types.SimpleNamespace(delta=types.SimpleNamespace(content=word))])
+            for word in words]
+
+
+class _AsyncChunks:
+    """Async iterator over pre-built stream chunks."""
+
+    def __init__(self, chunks):
+        self._chunks = iter(chunks)
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        try:
+            return next(self._chunks)
+        except StopIteration:
+            raise StopAsyncIteration
+
+
+@pytest.fixture
+def fake_openai(monkeypatch):
+    """Install a fake 'openai' module that records every client it constructs."""
+    module = types.ModuleType("openai")
+    module.clients = []
+
+    class OpenAI:
+        def __init__(self, **kwargs):
+            self.kwargs = kwargs
+            self.chat = types.SimpleNamespace(completions=types.SimpleNamespace(create=self._create))
+            module.clients.append(self)
+
+        def _create(self, **kwargs):
+            text = f"reply to {kwargs['messages'][-1]['content']}"
+            return _stream_chunks(text) if kwargs.get("stream") else _completion(text)
+
+    class AsyncOpenAI(OpenAI):
+        async def _create(self, **kwargs):
+            text = f"async reply to {kwargs['messages'][-1]['content']}"
+            return _AsyncChunks(_stream_chunks(text)) if kwargs.get("stream") else _completion(text)
+
+    module.OpenAI = OpenAI
+    module.AsyncOpenAI = AsyncOpenAI
+    monkeypatch.setitem(sys.modules, "openai", module)
+    return module
+
+
+class TestOpenAIProvider:
+    """Test OpenAIProvider client handling."""
+
+    def test_generate_reuses_client(self, fake_openai):
+        """Test that one sync client serves every generate call."""
+        provider = OpenAIProvider(api_key="test-key", request_timeout=3.0, max_retries=1)
+
+        assert provider.generate("first") == "reply to first"
+        assert provider.generate("second") == "reply to second"
+
+        assert len(fake_openai.clients) == 1
+        assert fake_openai.clients[0].kwargs == {"api_key": "test-key", "timeout": 3.0, "max_retries": 1}
+
+    def test_clients_are_per_provider(self, fake_openai):
+        """Test that separate providers do not share a client."""
+        OpenAIProvider(api_key="key-a").generate("hello")
+        OpenAIProvider(api_key="key-b").generate("hello")
+
+        assert [client.kwargs["api_key"] for client in fake_openai.clients] == ["key-a", "key-b"]
+
+    def test_agenerate_reuses_async_client(self, fake_openai):
+        """Test that one async client serves every agenerate call on the same event loop."""
+        provider = OpenAIProvider(api_key="test-key")
+
+        async def two_calls():
+            return [await provider.agenerate("first"), await provider.agenerate("second")]
+
+        assert asyncio.run(two_calls()) == ["async reply to first", "async reply to second"]
+        assert len(fake_openai.clients) == 1
+
+    def test_async_client_is_per_event_loop(self, fake_openai):
+        """Test that a new event loop gets a new async client."""
+        provider = OpenAIProvider(api_key="test-key")
+
+        asyncio.run(provider.agenerate("first"))
+        asyncio.run(provider.agenerate("second"))
+
+        assert len(fake_openai.clients) == 2
+
+    def test_stream_yields_deltas_and_reuses_client(self, fake_openai):
+        """Test that stream yields content deltas in order, skipping empty ones, on one client."""
+        provider = OpenAIProvider(api_key="test-key")
+
+        assert list(provider.stream("hi")) == ["reply ", "to ", "hi "]
+        assert list(provider.stream("again")) == ["reply ", "to ", "again "]
+        assert len(fake_openai.clients) == 1
+
+    def test_astream_yields_deltas_and_reuses_client(self, fake_openai):
+        """Test that astream yields content deltas in order and shares the loop's async client."""
+        provider = OpenAIProvider(api_key="test-key")
+
+        async def collect():
+            chunks = [chunk async for chunk in provider.astream("hi")]
+            await provider.agenerate("again")
+            return chunks
+
+        assert asyncio.run(collect()) == ["async ", "reply ", "to ", "hi "]
+        assert len(fake_openai.clients) == 1
+
+
+class _EchoProvider(LLMProvider):
+    """Provider that echoes its model and prompt, counting calls."""
+
+    def __init__(self, model):
+        self.model = model
+        self.calls = 0
+
+    def generate(self, prompt, max_tokens=200, system=None):
+        self.calls += 1
+        return f"{self.model}:{prompt}"
+
+    def cache_namespace(self):
+        return (type(self).__name__, self.model)
+
+
+class TestCachedLLMProvider:
+    """Test CachedLLMProvider serving repeated prompts from a PromptResponseCache."""
+
+    def test_repeated_prompt_is_served_from_cache(self):
+        """Test that only the first of two identical prompts reaches the provider."""
+        provider = _EchoProvider("m1")
+        cached = CachedLLMProvider(provider, PromptResponseCache())
+
+        assert cached.generate("hello") == cached.generate("hello") == "m1:hello"
+        assert provider.calls == 1
+
+    def test_key_includes_max_tokens_and_system(self):
+        """Test that changing max_tokens or the system prompt is a cache miss."""
+        provider = _EchoProvider("m1")
+        cached = CachedLLMProvider(provider, PromptResponseCache())
+
+        cached.generate("hello")
+        cached.generate("hello", max_tokens=50)
+        cached.generate("hello", system="be brief")
+
+        assert provider.calls == 3
+
+    def test_differently_configured_providers_do_not_share_responses(self):
+        """Test that two providers of one class with different models keep separate entries."""
+        cache = PromptResponseCache()
+        first = CachedLLMProvider(_EchoProvider("m1"), cache)
+        second = CachedLLMProvider(_EchoProvider("m2"), cache)
+
+        assert first.generate("hello") == "m1:hello"
+        assert second.generate("hello") == "m2:hello"
+
+    def test_openai_namespace_includes_model_and_temperature(self):
+        """Test that OpenAIProvider namespaces differ by model and by temperature."""
+        base = OpenAIProvider(api_key="test-key")
+        other_model = OpenAIProvider(api_key="test-key", model="gpt-4o-mini")
+        other_temperature = OpenAIProvider(api_key="test-key", temperature=0.0)
+
+        namespaces = {p.cache_namespace() for p in (base, other_model, other_temperature)}
+        assert len(namespaces) == 3
+        assert base.cache_namespace() == OpenAIProvider(api_key="other-key").cache_namespace()
+
+    def test_stream_caches_joined_chunks(self):
+        """Test that a streamed response is cached and replayed as one chunk."""
+        provider = _EchoProvider("m1")
+        cached = CachedLLMProvider(provider, PromptResponseCache())
+
+        assert list(cached.stream("hello")) == ["m1:hello"]
+        assert list(cached.stream("hello")) == ["m1:hello"]
+        assert provider.calls == 1
+
+
+class _LegacyProvider(LLMProvider):
+    """Provider written against the original generate(prompt, max_tokens) signature."""
+
+    def generate(self, prompt, max_tokens=200):
+        return f"legacy:{prompt}"
+
+
+class TestLegacyProviders:
+    """Test that providers without a system parameter keep working."""
+
+    @pytest.fixture
+    def agent(self, monkeypatch):
+        """Agent whose LLM is a _LegacyProvider registered through LLMService."""
+        monkeypatch.setitem(LLMService._providers, "legacy", _LegacyProvider)
+        return NegotiationAgent(llm_provider="legacy")
+
+    def test_system_is_omitted_when_unset(self, agent):
+        """Test that a call without system instructions passes the prompt unchanged."""
+        assert agent.generate_response("hello") == "legacy:hello"
+
+    def test_system_is_folded_into_the_prompt(self, agent):
+        """Test that system instructions are prepended to the prompt on every call path."""
+        expected = "legacy:Be brief.\n\nhello"
+
+        assert agent.generate_response("hello", system="Be brief.") == expected
+        assert asyncio.run(agent.agenerate_response("hello", system="Be brief.")) == expected
+        assert list(agent.stream_response("hello", system="Be brief.")) == [expected]
+
+        async def collect():
+            return [chunk async for chunk in agent.astream_response("hello", system="Be brief.")]
+
+        assert asyncio.run(collect()) == [expected]
+
+    def test_cached_wrapper(self):
+        """Test that CachedLLMProvider passes system instructions to a legacy provider the same way."""
+        cached = CachedLLMProvider(_LegacyProvider(), PromptResponseCache())
+
+        assert cached.generate("hello") == "legacy:hello"
+        assert cached.generate("hello", system="Be brief.") == "legacy:Be brief.\n\nhello"
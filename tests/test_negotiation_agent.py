@@ -0,0 +1,272 @@
+"""
+Tests for the vendor NegotiationAgent in backend/agents/negotiation_agent.py.
+"""
+
+import asyncio
+import json
+import pytest
+from backend.agents.negotiation_agent import NegotiationAgent
+from backend.services.llm_service import LLMProvider
+from backend.services.response_cache import SemanticResponseCache
+
+
+SELECTED_ITEM = {
+    "id": "SP-100",
+    "vendor": "Helios Dynamics",
+    "price": 4800,
+    "lead_time_days": 14,
+    "reliability": 0.985
+}
+
+
+class _ScriptedProvider(LLMProvider):
+    """Provider that answers after a delay (or raises), so tests control completion order."""
+
+    def __init__(self, reply, delay=0.0, error=None):
+        self.reply = reply
+        self.delay = delay
+        self.error = error
+
+    def generate(self, prompt, max_tokens=200, system=None):
+        if self.error is not None:
+            raise self.error
+        return self.reply
+
+    async def agenerate(self, prompt, max_tokens=200, system=None):
+        await asyncio.sleep(self.delay)
+        return self.generate(prompt, max_tokens=max_tokens, system=system)
+
+
+def _agent(provider):
+    """Build a negotiation agent for SELECTED_ITEM that uses the given provider."""
+    agent = NegotiationAgent(llm_provider="mock")
+    agent.llm = provider
+    agent._select_item(SELECTED_ITEM)
+    return agent
+
+
+class TestRespondToOffersBatch:
+    """Test concurrent buyer turns across negotiation sessions."""
+
+    def test_results_follow_input_order(self):
+        """Test that responses come back in turn order even when they finish out of order."""
+        turns = [
+            (_agent(_ScriptedProvider("We can do $4700 per unit.", delay=0.03)), "Lower price?", []),
+            (_agent(_ScriptedProvider("We can do $4600 per unit.", delay=0.0)), "Lower price?", []),
+            (_agent(_ScriptedProvider("We can do $4500 per unit.", delay=0.015)), "Lower price?", []),
+        ]
+
+        results = NegotiationAgent.respond_to_offers_batch(turns)
+
+        assert [result["message"].split("\n")[0] for result in results] == [
+            "We can do $4700 per unit.",
+            "We can do $4600 per unit.",
+            "We can do $4500 per unit.",
+        ]
+        assert [agent.negotiation_state["final_price"] for agent, _, _ in turns] == [4700.0, 4600.0, 4500.0]
+
+    def test_failure_does_not_cancel_other_turns(self):
+        """Test that a failing turn is returned as its exception while the others complete."""
+        error = RuntimeError("provider down")
+        turns = [
+            (_agent(_ScriptedProvider("We can do $4700 per unit.", delay=0.01)), "Lower price?", []),
+            (_agent(_ScriptedProvider("", error=error)), "Lower price?", []),
+            (_agent(_ScriptedProvider("We can do $4500 per unit.", delay=0.02)), "Lower price?", []),
+        ]
+
+        results = NegotiationAgent.respond_to_offers_batch(turns, concurrency_limit=2)
+
+        assert results[1] is error
+        assert results[0]["order_status"] == results[2]["order_status"] == "negotiating"
+        assert results[2]["message"].startswith("We can do $4500 per unit.")
+
+
+class TestSharedResponseCache:
+    """Test that the cross-session semantic cache only shares replies at the same negotiated terms."""
+
+    def _cached_agent(self, reply, cache):
+        agent = _agent(_ScriptedProvider(reply))
+        agent.response_cache = cache
+        return agent
+
+    def test_opening_turn_is_shared(self):
+        """Test that two fresh sessions asking the same question share one reply."""
+        cache = SemanticResponseCache(lambda text: [1.0, 0.0])
+        first = self._cached_agent("We can do $4700 per unit.", cache)
+        second = self._cached_agent("We can do $4500 per unit.", cache)
+
+        first.respond_to_offer("Lower price?", [])
+        result = second.respond_to_offer("Lower price?", [])
+
+        assert result["message"].startswith("We can do $4700 per unit.")
+        assert cache.stats()["hits"] == 1
+
+    def test_later_round_does_not_replay_an_earlier_reply(self):
+        """Test that a session with different negotiated terms gets its own reply."""
+        cache = SemanticResponseCache(lambda text: [1.0, 0.0])
+        first = self._cached_agent("We can do $4700 per unit.", cache)
+        second = self._cached_agent("We can do $4550 per unit.", cache)
+        second.negotiation_state["final_price"] = 4600.0  # already offered in this session
+
+        first.respond_to_offer("Lower price?", [])
+        result = second.respond_to_offer("Lower price?", [])
+
+        assert result["message"].startswith("We can do $4550 per unit.")
+        assert cache.stats()["hits"] == 0
+
+
+def _vendor(message):
+    return {"role": "vendor", "message": message}
+
+
+def _buyer(message):
+    return {"role": "buyer", "message": message}
+
+
+class TestNegotiationContext:
+    """Test the token-budgeted conversation window and the summary of evicted messages."""
+
+    def test_short_conversation_is_kept_whole(self):
+        """Test that a conversation within budget is included without a summary."""
+        agent = _agent(_ScriptedProvider(""))
+        conversation = [_vendor("Opening at $4800 per unit."), _buyer("Too high.")]
+
+        context = agent._build_negotiation_context(conversation)
+
+        assert context == "Vendor: Opening at $4800 per unit.\nBuyer: Too high."
+
+    def test_oldest_messages_are_evicted_first(self):
+        """Test that the window drops the oldest messages once over budget, keeping the newest."""
+        agent = _agent(_ScriptedProvider(""))
+        conversation = [_buyer(f"Message {i} " + "filler " * 20) for i in range(6)]
+
+        context = agent._build_negotiation_context(conversation, max_tokens=100)
+
+        lines = context.split("\n")
+        assert lines[0].startswith("[") and "earlier messages omitted" in lines[0]
+        assert lines[-1].startswith("Buyer: Message 5")
+        assert "Message 0" not in context
+        dropped = int(lines[0][1:].split()[0])
+        assert dropped + len(lines) - 1 == len(conversation)
+
+    def test_newest_message_is_always_kept(self):
+        """Test that a single message over budget is still included."""
+        agent = _agent(_ScriptedProvider(""))
+        conversation = [_buyer("short"), _buyer("long " * 200)]
+
+        context = agent._build_negotiation_context(conversation, max_tokens=10)
+
+        assert context.endswith("Buyer: " + "long " * 200)
+        assert context.startswith("[1 earlier messages omitted]")
+
+    def test_incremental_window_matches_rebuild(self):
+        """Test that extending the cached window gives the same context as a fresh build."""
+        conversation = [_buyer(f"Message {i} " + "filler " * 20) for i in range(4)]
+        incremental = _agent(_ScriptedProvider(""))
+        incremental._build_negotiation_context(conversation, max_tokens=100)
+
+        conversation = conversation + [_buyer("Message 4 " + "filler " * 20)]
+        fresh = _agent(_ScriptedProvider(""))
+
+        assert (incremental._build_negotiation_context(conversation, max_tokens=100)
+                == fresh._build_negotiation_context(conversation, max_tokens=100))
+
+    def test_summary_lists_negotiated_quotes_not_footer_prices(self):
+        """Test that evicted vendor quotes are summarized from the reply body, without repeats."""
+        agent = _agent(_ScriptedProvider(""))
+        conversation = []
+        for reply in ("We can do $4700 per unit.", "Best we can do is $4600 per unit.",
+                      "Still $4600 per unit, final."):
+            conversation.append(_buyer("Lower price? " + "filler " * 20))
+            # Vendor replies carry the order summary footer ("Unit Price: $...")
+            conversation.append(_vendor(agent._finalize_response(reply, 0)["message"]))
+        conversation.append(_buyer("Latest question"))
+
+        context = agent._build_negotiation_context(conversation, max_tokens=10)
+
+        summary = context.split("\n")[0]
+        assert summary == "[6 earlier messages omitted; vendor prices quoted in them: $4700, $4600]"
+
+
+class _ChunkedProvider(LLMProvider):
+    """Provider that streams a fixed reply in several chunks."""
+
+    CHUNKS = ["We can ", "do $4650 ", "per unit ", "for 50+ units."]
+
+    def generate(self, prompt, max_tokens=200, system=None):
+        return "".join(self.CHUNKS)
+
+    def stream(self, prompt, max_tokens=200, system=None):
+        yield from self.CHUNKS
+
+    async def astream(self, prompt, max_tokens=200, system=None):
+        for chunk in self.CHUNKS:
+            await asyncio.sleep(0)
+            yield chunk
+
+
+class TestStreamingResponses:
+    """Test the token/final event streams of stream_response_to_offer and its async variant."""
+
+    def _check_events(self, agent, events):
+        tokens = [event["content"] for event in events[:-1]]
+        final = events[-1]
+
+        assert all(event["type"] == "token" for event in events[:-1])
+        assert tokens == _ChunkedProvider.CHUNKS
+        assert final["type"] == "final"
+        assert final["message"].startswith("".join(_ChunkedProvider.CHUNKS) + "\n\n")
+        assert "Unit Price: $4650" in final["message"]
+        assert final["order_status"] == "negotiating"
+        assert agent.negotiation_state["final_price"] == 4650.0
+
+    def test_stream_response_to_offer(self):
+        """Test that token events arrive in order, followed by the final response."""
+        agent = _agent(_ChunkedProvider())
+
+        events = list(agent.stream_response_to_offer("Volume discount?", []))
+
+        self._check_events(agent, events)
+
+    def test_astream_response_to_offer(self):
+        """Test the async stream yields the same events as the sync one."""
+        agent = _agent(_ChunkedProvider())
+
+        async def collect():
+            return [event async for event in agent.astream_response_to_offer("Volume discount?", [])]
+
+        self._check_events(agent, asyncio.run(collect()))
+
+    def test_confirmation_reply_is_a_single_final_event(self):
+        """Test that confirming the order streams only the final event, without an LLM call."""
+        agent = _agent(_ChunkedProvider())
+        list(agent.stream_response_to_offer("Volume discount?", []))
+
+        events = list(agent.stream_response_to_offer("Yes, confirm", []))
+
+        assert len(events) == 1
+        assert events[0]["type"] == "final"
+        assert events[0]["order_status"] == "confirmed"
+        assert events[0]["receipt"]["unit_price"] == 4650.0
+
+    def test_ndjson_endpoint(self, monkeypatch):
+        """Test that /api/negotiate/chat/stream emits one JSON line per event, final line last."""
+        pytest.importorskip("fastapi")
+        pytest.importorskip("httpx")
+        monkeypatch.setenv("ENABLE_EMBEDDINGS", "false")
+        from fastapi.testclient import TestClient
+        from backend import api
+
+        monkeypatch.setitem(api.negotiation_sessions, "stream-test", _agent(_ChunkedProvider()))
+        response = TestClient(api.app).post("/api/negotiate/chat/stream", json={
+            "user_message": "Volume discount?",
+            "selected_item": SELECTED_ITEM,
+            "request": {},
+            "session_id": "stream-test"
+        })
+
+        assert response.headers["content-type"].startswith("application/x-ndjson")
+        events = [json.loads(line) for line in response.text.splitlines()]
+        assert [event["content"] for event in events[:-1]] == _ChunkedProvider.CHUNKS
+        assert events[-1]["type"] == "final"
+        assert events[-1]["session_id"] == "stream-test"
@@ -0,0 +1,85 @@
+"""
+Tests for the plan cache in backend/core/plan_cache.py and its use by the API.
+"""
+
+import pytest
+from backend.core.plan_cache import PlanCache
+from backend.core.procurement import plan_procurement
+
+
+REQUEST = {
+    "component": "solar_panel",
+    "spec_filters": {"power_w": 140},
+    "max_cost": 6000,
+    "latest_delivery_days": 30,
+    "weights": {"price": 0.4, "lead_time": 0.3, "reliability": 0.3}
+}
+
+
+class TestPlanCache:
+    """Test PlanCache keys, copies and LRU eviction."""
+
+    def test_lru_eviction(self):
+        """Test that the least recently used entry is evicted when the cache is full."""
+        cache = PlanCache(max_entries=2)
+        cache.put("a", {"plan": "a"})
+        cache.put("b", {"plan": "b"})
+        cache.get("a")  # a is now most recent
+        cache.put("c", {"plan": "c"})  # evicts b
+
+        assert cache.get("a") == {"plan": "a"}
+        assert cache.get("b") is None
+        assert cache.get("c") == {"plan": "c"}
+        assert cache.stats() == {"hits": 3, "misses": 1, "entries": 2}
+
+    def test_key_sensitivity(self):
+        """Test that the key changes with request values and options, but not with dict order."""
+        key = PlanCache.make_key(REQUEST, top_k=3, investigate=False)
+
+        reordered = dict(reversed(list(REQUEST.items())))
+        assert PlanCache.make_key(reordered, investigate=False, top_k=3) == key
+        assert PlanCache.make_key({**REQUEST, "max_cost": 5000}, top_k=3, investigate=False) != key
+        assert PlanCache.make_key(REQUEST, top_k=2, investigate=False) != key
+        assert PlanCache.make_key(REQUEST, top_k=3, investigate=True) != key
+
+    def test_results_are_copied(self):
+        """Test that modifying a stored or returned result does not change the cached entry."""
+        cache = PlanCache()
+        result = {"selected": {"id": "SP-100"}}
+        cache.put("k", result)
+        result["selected"]["id"] = "changed"
+
+        returned = cache.get("k")
+        returned["selected"]["id"] = "changed again"
+
+        assert cache.get("k") == {"selected": {"id": "SP-100"}}
+
+
+class TestProcurementEndpointCache:
+    """Test the ENABLE_PLAN_CACHE plan cache in the /api/procurement endpoint."""
+
+    def test_repeated_mock_request_is_served_from_cache(self, monkeypatch):
+        """Test that a repeated mock request returns the first plan unchanged without re-planning."""
+        pytest.importorskip("fastapi")
+        pytest.importorskip("httpx")
+        monkeypatch.setenv("ENABLE_EMBEDDINGS", "false")
+        from fastapi.testclient import TestClient
+        from backend import api
+
+        calls = []
+
+        def counting_plan_procurement(**kwargs):
+            calls.append(kwargs)
+            return plan_procurement(**kwargs)
+
+        monkeypatch.setattr(api, "plan_cache", PlanCache())
+        monkeypatch.setattr(api, "plan_procurement", counting_plan_procurement)
+        client = TestClient(api.app)
+        body = {**REQUEST, "top_k": 2, "llm_provider": "mock", "api_key": "test-key"}
+
+        first = client.post("/api/procurement", json=body)
+        second = client.post("/api/procurement", json=body)
+
+        assert first.status_code == second.status_code == 200
+        assert second.json() == first.json()
+        assert len(calls) == 1
@@ -1,12 +1,11 @@
 # tests/test_procurement.py
 import pytest
-from backend.core.catalog import Catalog
-from backend.core.procurement import compute_score, plan_procurement, price_history_tool, availability_tool, run_flow
+from backend.core import procurement
+from backend.core.procurement import compute_score, compute_scores_vec, plan_procurement, price_history_tool, availability_tool, run_flow
 from backend.core.llm_adapter import LLMAdapter, MockLLM
 
-def test_catalog_search_and_get():
+def test_catalog_search_and_get(catalog):
     # Test Catalog search and get methods
-    catalog = Catalog("catalog.json")
 
     # Test search without filters
     solar_panels = catalog.search("solar_panel")
@@ -151,6 +150,46 @@ def test_run_flow():
     assert "trace" in result
 
 
+def test_run_flow_hard_constraints():
+    """Test that run_flow drops candidates over max_cost or latest_delivery_days, like plan_procurement."""
+    request = {
+        "component": "battery",
+        "spec_filters": None,
+        "max_cost": 3500,
+        "latest_delivery_days": 20
+    }
+
+    result = run_flow(request, investigate=False, llm=None, top_k=5)
+
+    # BAT-100 is over budget; BAT-80 and BAT-150 deliver too late
+    assert {c["id"] for c in result["candidates"]} == {"BAT-50", "BAT-120"}
+    for candidate in result["candidates"]:
+        assert candidate["price"] <= 3500
+        assert candidate["lead_time_days"] <= 20
+
+    expected = plan_procurement(request, top_k=5, investigate=False)
+    assert [c["id"] for c in result["candidates"]] == [c["id"] for c in expected["candidates"]]
+
+
+def test_run_flow_scores_the_searched_catalog(monkeypatch):
+    """Test that the LangGraph scoring node reuses the catalog the search node loaded."""
+    pytest.importorskip("langgraph")
+    loads = []
+    load_catalog = procurement._load_catalog
+
+    def counting_load_catalog():
+        loads.append(1)
+        return load_catalog()
+
+    monkeypatch.setattr(procurement, "_load_catalog", counting_load_catalog)
+    request = {"component": "battery", "spec_filters": None, "max_cost": 5000, "latest_delivery_days": 20}
+
+    result = run_flow(request, investigate=False, llm=None, top_k=2)
+
+    assert result["candidates"]
+    assert len(loads) == 1
+
+
 def test_plan_procurement_no_candidates():
     """Test error handling when no candidates match."""
     request = {
@@ -371,6 +410,25 @@ class TestScoring:
         # item_high_rel has higher reliability, so should score higher
         assert score2 > score1
 
+    def test_compute_scores_vec_matches_scalar(self):
+        """Vectorized scoring should produce exactly the scalar compute_score values."""
+        items = [
+            {"id": "TEST-1", "price": 1000, "lead_time_days": 10, "reliability": 0.95},
+            {"id": "TEST-2", "price": 2000, "lead_time_days": 20, "reliability": 0.98},
+            {"id": "TEST-3", "price": 1500, "lead_time_days": 12, "reliability": 0.90}
+        ]
+        request = {"weights": {"price": 0.5, "lead_time": 0.2}}
+
+        expected = [compute_score(item, request, 1000, 2000, 10, 20) for item in items]
+        scores = compute_scores_vec(
+            [item["price"] for item in items],
+            [item["lead_time_days"] for item in items],
+            [item["reliability"] for item in items],
+            request
+        )
+
+        assert scores.tolist() == expected
+
 
 # ============================================================================
 # TOOL TESTS (from test_tools.py)
@@ -392,19 +450,11 @@ class TestTools:
         assert isinstance(result["history"], list)
         assert len(result["history"]) == 4
 
-        # Check each entry has date and price
+        # Check each entry has a date string and an integer price
         for entry in result["history"]:
-            assert "date" in entry
-            assert "price" in entry
+            assert isinstance(entry["date"], str)
             assert isinstance(entry["price"], int)
 
-    def test_price_history_tool_determinism(self):
-        """Test that price_history_tool is deterministic."""
-        result1 = price_history_tool("SP-100")
-        result2 = price_history_tool("SP-100")
-
-        assert result1 == result2
-
     def test_availability_tool_structure(self):
         """Test that availability_tool returns expected structure."""
         result = availability_tool("Helios Dynamics")
@@ -421,9 +471,46 @@ class TestTools:
         assert isinstance(result["lead_time_samples"], list)
         assert len(result["lead_time_samples"]) == 3
 
+    def test_price_history_tool_determinism(self):
+        """Test that price_history_tool is deterministic and returns a fresh result per call."""
+        result1 = price_history_tool("SP-100")
+        result2 = price_history_tool("SP-100")
+
+        assert result1 == result2
+        assert result1 is not result2
+
+        # Modifying one result must not leak into later calls (the points are memoized)
+        expected = price_history_tool("SP-100")
+        result1["history"][0]["price"] = -1
+        result1["history"].append({"date": "2000-01-01", "price": 0})
+        assert price_history_tool("SP-100") == expected
+
+        # Prices are seeded from the item ID, so they are the same in every process
+        assert [entry["price"] for entry in expected["history"]] == [1301, 1449, 1482, 1225]
+
     def test_availability_tool_determinism(self):
-        """Test that availability_tool is deterministic."""
+        """Test that availability_tool is deterministic and returns a fresh result per call."""
         result1 = availability_tool("Helios Dynamics")
         result2 = availability_tool("Helios Dynamics")
 
-        assert result1 == result2
\ No newline at end of file
+        assert result1 == result2
+        assert result1 is not result2
+
+        # Modifying one result must not leak into later calls (the values are memoized)
+        expected = availability_tool("Helios Dynamics")
+        result1["lead_time_samples"].append(0)
+        result1["in_stock"] = not result1["in_stock"]
+        assert availability_tool("Helios Dynamics") == expected
+
+        # Values are seeded from the vendor name, so they are the same in every process
+        assert expected["lead_time_samples"] == [32, 33, 37]
+
+    def test_investigate_candidates_in_parallel(self, catalog):
+        """Test that a batch large enough for the thread pool gets the same results as inline calls."""
+        candidates = catalog.items  # every catalog item, well above the parallel threshold
+        assert len(candidates) >= procurement._PARALLEL_TOOLS_MIN_CANDIDATES
+
+        results = procurement._investigate_candidates(candidates)
+
+        assert procurement._tool_executor.cache_info().currsize == 1
+        assert results == [(price_history_tool(c["id"]), availability_tool(c["vendor"])) for c in candidates]
@@ -0,0 +1,149 @@
+"""
+Tests for the LLM response caches in backend/services/response_cache.py.
+"""
+
+import sys
+import threading
+import time
+from backend.services.response_cache import SemanticResponseCache
+
+
+def _topic_embedding(text):
+    """Embed by topic, so differently worded questions on one topic are identical."""
+    if "price" in text:
+        return [1.0, 0.0]
+    if "discount" in text:
+        # cos ~0.89 to the price direction
+        return [2.0, 1.0]
+    return [0.0, 1.0]
+
+
+class _Generator:
+    """Counts calls and returns a distinct response for each one."""
+
+    def __init__(self):
+        self.calls = 0
+
+    def __call__(self):
+        self.calls += 1
+        return f"response-{self.calls}"
+
+
+class TestSemanticResponseCache:
+    """Test hit, miss, threshold and eviction behavior of SemanticResponseCache."""
+
+    def test_near_duplicate_is_a_hit(self):
+        """Test that a reworded question in the same namespace reuses the response."""
+        cache = SemanticResponseCache(_topic_embedding)
+        generate = _Generator()
+
+        first = cache.get_or_generate(("SP-100",), "What is the price?", generate)
+        second = cache.get_or_generate(("SP-100",), "Can you tell me the PRICE please", generate)
+
+        assert first == second == "response-1"
+        assert generate.calls == 1
+        assert cache.stats() == {"hits": 1, "misses": 1, "namespaces": 1}
+
+    def test_different_topic_is_a_miss(self):
+        """Test that an unrelated question generates a new response."""
+        cache = SemanticResponseCache(_topic_embedding)
+        generate = _Generator()
+
+        cache.get_or_generate(("SP-100",), "What is the price?", generate)
+        response = cache.get_or_generate(("SP-100",), "When is delivery?", generate)
+
+        assert response == "response-2"
+        assert cache.stats()["misses"] == 2
+
+    def test_numbers_and_namespace_partition_the_cache(self):
+        """Test that neither a different quantity nor a different item is served from cache."""
+        cache = SemanticResponseCache(_topic_embedding)
+        generate = _Generator()
+
+        cache.get_or_generate(("SP-100",), "price for 50 units?", generate)
+        cache.get_or_generate(("SP-100",), "price for 10 units?", generate)
+        cache.get_or_generate(("SP-200",), "price for 50 units?", generate)
+
+        assert generate.calls == 3
+        assert cache.stats()["hits"] == 0
+
+    def test_threshold(self):
+        """Test that similarity below the threshold misses and above it hits."""
+        strict = SemanticResponseCache(_topic_embedding, threshold=0.92)
+        loose = SemanticResponseCache(_topic_embedding, threshold=0.85)
+
+        for cache in (strict, loose):
+            cache.get_or_generate(("SP-100",), "price?", _Generator())
+
+        assert strict.get_or_generate(("SP-100",), "discount?", lambda: "fresh") == "fresh"
+        assert loose.get_or_generate(("SP-100",), "discount?", lambda: "fresh") == "response-1"
+
+    def test_entry_eviction(self):
+        """Test that only the newest entries of a namespace are kept."""
+        cache = SemanticResponseCache(_topic_embedding, max_entries_per_namespace=1)
+        generate = _Generator()
+
+        cache.get_or_generate(("SP-100",), "price?", generate)
+        cache.get_or_generate(("SP-100",), "delivery?", generate)
+        response = cache.get_or_generate(("SP-100",), "price?", generate)
+
+        assert response == "response-3"
+
+    def test_namespace_eviction(self):
+        """Test that the least recently used namespace is evicted first."""
+        cache = SemanticResponseCache(_topic_embedding, max_namespaces=2)
+        generate = _Generator()
+
+        cache.get_or_generate(("A",), "price?", generate)
+        cache.get_or_generate(("B",), "price?", generate)
+        cache.get_or_generate(("A",), "price?", generate)  # A is now most recent
+        cache.get_or_generate(("C",), "price?", generate)  # evicts B
+
+        assert cache.get_or_generate(("A",), "price?", generate) == "response-1"
+        assert cache.get_or_generate(("B",), "price?", generate) == "response-4"
+        assert cache.stats()["namespaces"] == 2
+
+    def test_embeddings_unavailable_passes_through(self):
+        """Test that every call generates when the embedder returns nothing."""
+        cache = SemanticResponseCache(lambda text: None)
+        generate = _Generator()
+
+        cache.get_or_generate(("SP-100",), "price?", generate)
+        cache.get_or_generate(("SP-100",), "price?", generate)
+
+        assert generate.calls == 2
+        assert cache.stats() == {"hits": 0, "misses": 2, "namespaces": 0}
+
+    def test_concurrent_access(self):
+        """Test that shared use from many threads with constant eviction raises nothing."""
+        cache = SemanticResponseCache(_topic_embedding, max_entries_per_namespace=2, max_namespaces=2)
+        errors = []
+
+        def generate():
+            time.sleep(0)  # yield to other threads between the lookup and the insert
+            return "r"
+
+        def worker(thread_index):
+            try:
+                for i in range(300):
+                    namespace = ((thread_index + i) % 5,)
+                    cache.get_or_generate(namespace, "price?" if i % 2 else "delivery?", generate)
+            except Exception as e:
+                errors.append(e)
+
+        # Switch threads as often as possible so unguarded read-modify-write sequences interleave
+        switch_interval = sys.getswitchinterval()
+        sys.setswitchinterval(1e-6)
+        try:
+            threads = [threading.Thread(target=worker, args=(t,)) for t in range(8)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        finally:
+            sys.setswitchinterval(switch_interval)
+
+        assert errors == []
+        stats = cache.stats()
+        assert stats["hits"] + stats["misses"] == 8 * 300
+        assert stats["namespaces"] <= 2